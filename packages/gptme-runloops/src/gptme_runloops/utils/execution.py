@@ -1,45 +1,101 @@
 """Execution utilities for running gptme, Claude Code, and Codex."""
 
+import asyncio
+import fcntl
+import functools
+import itertools
 import logging
 import os
+import selectors
 import shlex
 import shutil
+import signal
 import subprocess
 import sys
-from datetime import datetime
+import tempfile
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Union
 
 logger = logging.getLogger(__name__)
 
 # Global log directory (not in workspace to prevent Issue #151 recursive grep)
 GLOBAL_LOG_DIR = Path.home() / ".cache" / "gptme" / "logs"
-GLOBAL_LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+# Compiled context is reused while its inputs are unchanged. Commits, index
+# changes and added/removed tasks invalidate it via the fingerprint; the TTL
+# bounds staleness from changes that touch none of those mtimes (e.g. editing
+# a task file in place without staging it).
+CONTEXT_CACHE_TTL = 300
+_context_cache: dict[tuple[Path, str, str], tuple[tuple, float, bytes]] = {}
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _context_fingerprint(workspace: Path, instruction_doc: str) -> tuple:
+    """Cheap fingerprint of the inputs to compile-context.sh.
+
+    Covers the script and instruction doc plus the git state and tasks
+    directory the script reports on, so a follow-up run sees the previous
+    run's commits.
+    """
+    shared_dir = workspace / "scripts" / "shared"
+    git_dir = workspace / ".git"
+    return (
+        _mtime(shared_dir / "compile-context.sh"),
+        _mtime(shared_dir),
+        _mtime(workspace / instruction_doc),
+        _mtime(git_dir / "HEAD"),
+        _mtime(git_dir / "index"),
+        # Appended to on every commit, checkout and reset
+        _mtime(git_dir / "logs" / "HEAD"),
+        _mtime(workspace / "tasks"),
+    )
 
 
 def compile_context(
     workspace: Path,
     runtime: str,
     instruction_doc: str,
-) -> str:
+) -> bytes:
     """Compile workspace context using the shared compile-context.sh script.
 
     Mirrors what run-with-claude.sh and run-with-codex.sh do before launching
     their respective backends: runs compile-context.sh to produce
     tmp/full-context.md, then returns its contents.
 
+    Results are cached per (workspace, runtime, instruction_doc) and reused
+    for up to CONTEXT_CACHE_TTL seconds while the script, scripts/shared, the
+    instruction doc, the git HEAD/index/reflog and tasks/ are unmodified.
+
     Args:
         workspace: Path to workspace directory
         runtime: Runtime name (e.g. "Claude Code", "Codex")
         instruction_doc: Instruction doc filename (e.g. "CLAUDE.md", "AGENTS.md")
 
     Returns:
-        Compiled context string, or empty string if compilation fails
+        Compiled context as raw bytes, or b"" if compilation fails
     """
     compile_script = workspace / "scripts" / "shared" / "compile-context.sh"
     if not compile_script.exists():
         logger.warning(f"Context compilation script not found: {compile_script}")
-        return ""
+        return b""
+
+    cache_key = (workspace, runtime, instruction_doc)
+    fingerprint = _context_fingerprint(workspace, instruction_doc)
+    cached = _context_cache.get(cache_key)
+    if (
+        cached
+        and cached[0] == fingerprint
+        and time.monotonic() - cached[1] < CONTEXT_CACHE_TTL
+    ):
+        return cached[2]
 
     try:
         result = subprocess.run(
@@ -51,29 +107,93 @@ def compile_context(
                 instruction_doc,
             ],
             cwd=workspace,
-            capture_output=True,
-            text=True,
+            env=_compile_env(),
+            # The payload is tmp/full-context.md; stdout is never looked at
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=30,
         )
         if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace")
             logger.warning(
-                f"Context compilation failed (exit {result.returncode}): {result.stderr}"
+                f"Context compilation failed (exit {result.returncode}): {stderr}"
             )
-            return ""
+            return b""
 
         context_file = workspace / "tmp" / "full-context.md"
         if context_file.exists():
-            return context_file.read_text()
+            context = context_file.read_bytes()
+            _context_cache[cache_key] = (fingerprint, time.monotonic(), context)
+            return context
 
         logger.warning("Context compiled but tmp/full-context.md not found")
-        return ""
+        return b""
 
     except subprocess.TimeoutExpired:
         logger.warning("Context compilation timed out")
-        return ""
+        return b""
     except Exception as e:
         logger.warning(f"Context compilation error: {e}")
-        return ""
+        return b""
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_which(name: str, extra_paths: tuple[Path, ...]) -> str:
+    path = shutil.which(name)
+    if path:
+        return path
+    for candidate in extra_paths:
+        if candidate.exists():
+            return str(candidate)
+    # Raising (rather than returning None) keeps misses out of the cache
+    raise FileNotFoundError(name)
+
+
+def _resolve_executable(
+    name: str, not_found: str, extra_paths: tuple[Path, ...] = ()
+) -> str:
+    """Resolve a backend executable, walking PATH only once per process.
+
+    Set GPTME_RUNLOOPS_REFRESH_PATHS=1 to force a fresh lookup.
+
+    Args:
+        name: Executable name to look up in PATH
+        not_found: Error message if the executable cannot be found
+        extra_paths: Fallback locations checked if not in PATH
+
+    Returns:
+        Path to the executable
+
+    Raises:
+        RuntimeError: If the executable cannot be found
+    """
+    if os.environ.get("GPTME_RUNLOOPS_REFRESH_PATHS") == "1":
+        _cached_which.cache_clear()
+    try:
+        return _cached_which(name, extra_paths)
+    except FileNotFoundError:
+        raise RuntimeError(not_found) from None
+
+
+@functools.lru_cache(maxsize=1)
+def _base_env() -> dict[str, str]:
+    """Snapshot of os.environ shared by all backend runs.
+
+    Taken on first use so each run only builds one merged dict. Call
+    ``_base_env.cache_clear()`` after modifying os.environ to pick up the
+    change. Callers must not mutate the returned dict.
+    """
+    return os.environ.copy()
+
+
+# Variables passed through to compile-context.sh; extend if the script needs more
+_COMPILE_ENV_VARS = ("PATH", "HOME", "USER", "LANG", "LC_ALL", "TMPDIR")
+
+
+@functools.lru_cache(maxsize=1)
+def _compile_env() -> dict[str, str]:
+    """Minimal environment for the compile-context.sh subprocess."""
+    return {k: os.environ[k] for k in _COMPILE_ENV_VARS if k in os.environ}
 
 
 class ExecutionResult:
@@ -85,142 +205,377 @@ class ExecutionResult:
         self.success = exit_code == 0
 
 
-def execute_gptme(
-    prompt: str,
+def _signal_group(pid: int, sig: int) -> bool:
+    """Send sig to the process group led by pid; False if it is already gone."""
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _terminate_group(proc: subprocess.Popen) -> None:
+    """Stop a backend's process group: SIGTERM, then SIGKILL after 5s."""
+    if not _signal_group(proc.pid, signal.SIGTERM):
+        return
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        _signal_group(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+async def _terminate_group_async(proc: asyncio.subprocess.Process) -> None:
+    """Async counterpart of _terminate_group."""
+    if not _signal_group(proc.pid, signal.SIGTERM):
+        return
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=5)
+    except asyncio.TimeoutError:
+        _signal_group(proc.pid, signal.SIGKILL)
+        await proc.wait()
+
+
+# Bursty stream-json output fills the default 64 KiB pipe quickly; a larger
+# pipe means fewer blocked writes in the child and fewer reads here
+PIPE_SIZE = 1 << 20
+
+
+def _grow_pipe(fd: int) -> None:
+    """Enlarge a pipe's capacity where supported (Linux), ignoring failures."""
+    setpipe_sz = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if setpipe_sz is None:
+        return
+    try:
+        fcntl.fcntl(fd, setpipe_sz, PIPE_SIZE)
+    except OSError:
+        # Above /proc/sys/fs/pipe-max-size for unprivileged users
+        pass
+
+
+def _run_streaming(
+    cmd: list[str],
     workspace: Path,
+    env: dict,
+    log_fh,
     timeout: int,
-    non_interactive: bool = True,
-    shell_timeout: int = 120,
-    env: Optional[dict] = None,
-    run_type: str = "run",
-    tools: Optional[str] = None,
-) -> ExecutionResult:
-    """Execute gptme with the given prompt.
+    input: Union[bytes, Callable[[], bytes], None] = None,
+) -> int:
+    """Run a command, streaming its combined stdout/stderr to terminal and log.
+
+    Replaces the previous ``bash -c "... | tee log"`` pipeline: the child is
+    spawned directly (no shell) and the parent fans its output out to both
+    ``sys.stdout`` and the already-open log file handle. A single selector
+    loop feeds stdin and drains stdout, so neither side can deadlock on a
+    full pipe and no helper thread is needed.
 
     Args:
-        prompt: Prompt text to pass to gptme
+        cmd: Command argv
         workspace: Working directory for execution
+        env: Environment for the child process
+        log_fh: Binary file handle the output is appended to
         timeout: Maximum execution time in seconds
-        non_interactive: Run in non-interactive mode
-        shell_timeout: Shell command timeout in seconds
-        env: Additional environment variables
-        run_type: Type of run (for log file naming)
-        tools: Tool allowlist string (e.g. "gptodo,save,append")
+        input: Optional bytes written to the child's stdin, or a callable
+            producing them. A callable is only invoked once the child has been
+            spawned, so slow preparation overlaps the backend's startup.
 
     Returns:
-        ExecutionResult with exit code and status
+        Exit code of the child process
+
+    Raises:
+        subprocess.TimeoutExpired: If the child does not exit within timeout
     """
-    # Create global log file for this run
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    log_file = GLOBAL_LOG_DIR / f"{run_type}-{timestamp}.log"
-    # Create temporary prompt file
-    prompt_file = workspace / f".gptme-prompt-{os.getpid()}.txt"
-    prompt_file.write_text(prompt)
+    deadline = time.monotonic() + timeout
+    out = sys.stdout.buffer
+    # Keep this launch on CPython's cheap spawn path (vfork on Linux): no
+    # shell, no preexec_fn, no user/group changes and default close_fds.
+    # A full fork() would copy the parent's page tables on every run.
+    proc = subprocess.Popen(
+        cmd,
+        cwd=workspace,
+        env=env,
+        stdin=subprocess.PIPE if input is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+        # Own process group, so timeouts can stop everything the backend spawned
+        start_new_session=True,
+    )
+    assert proc.stdout is not None
+    _grow_pipe(proc.stdout.fileno())
+    stdin = proc.stdin
 
-    try:
-        # Build gptme command
-        # Find gptme in PATH (typically pipx-managed)
-        gptme_path = shutil.which("gptme")
-        if not gptme_path:
-            raise RuntimeError(
-                "gptme not found in PATH. Install with: pipx install gptme"
-            )
-        cmd = [gptme_path]
-        if non_interactive:
-            cmd.append("--non-interactive")
-
-        if tools:
-            cmd.extend(["--tools", tools])
-
-        # this line is essential for the prompt file path to not be mistaken for a command
-        cmd.append("'Here is the prompt to follow:'")
-
-        # mentioning the file here includes its contents in the initial message
-        cmd.append(str(prompt_file))
-
-        # Set up environment
-        run_env = os.environ.copy()
-        run_env["GPTME_SHELL_TIMEOUT"] = str(shell_timeout)
-        run_env["GPTME_CHAT_HISTORY"] = "true"
-
-        if env:
-            run_env.update(env)
-
-        # Use tee to stream output to both terminal and log file
-        # This gives us real-time journald logging AND complete log file
-        # Use shlex.join for proper escaping to prevent command injection
-        cmd_with_tee = f"{shlex.join(cmd)} 2>&1 | tee {shlex.quote(str(log_file))}"
-
-        # Write header to log file first
-        with log_file.open("w") as f:
-            f.write(f"=== {run_type} run at {timestamp} ===\n")
-            f.write(f"Working directory: {workspace}\n")
-            f.write(f"Command: {' '.join(cmd)}\n")
-            f.write(f"Timeout: {timeout}s\n")
-            f.write(f"Shell timeout: {shell_timeout}s\n\n")
-            f.write("=== Output ===\n")
-
-        # Execute with tee - streams to both stdout and log file
+    with proc, selectors.DefaultSelector() as sel:
         try:
-            result = subprocess.run(
-                cmd_with_tee,
-                shell=True,  # Required for pipe
-                cwd=workspace,
-                env=run_env,
-                timeout=timeout,
-            )
+            if callable(input):
+                input = input()
+            # Slicing a memoryview doesn't copy, so draining a large prompt
+            # stays linear
+            pending = memoryview(input or b"")
+
+            sel.register(proc.stdout, selectors.EVENT_READ)
+            if stdin is not None:
+                if pending:
+                    os.set_blocking(stdin.fileno(), False)
+                    sel.register(stdin, selectors.EVENT_WRITE)
+                else:
+                    stdin.close()
+
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Don't wait for EOF: orphaned grandchildren may hold the pipe
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+
+                for key, _ in sel.select(remaining):
+                    if key.fileobj is proc.stdout:
+                        data = os.read(key.fd, 65536)
+                        if not data:
+                            sel.unregister(proc.stdout)
+                            continue
+                        log_fh.write(data)
+                        out.write(data)
+                        out.flush()
+                    elif stdin is not None:
+                        try:
+                            pending = pending[os.write(key.fd, pending[:65536]) :]
+                        except BrokenPipeError:
+                            pending = pending[:0]
+                        if not pending:
+                            sel.unregister(key.fileobj)
+                            stdin.close()
+
+            return proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except BaseException:
+            # The child runs in its own session, so neither Ctrl-C nor Popen's
+            # unbounded wait() on exit would stop it; covers timeouts and
+            # errors such as BrokenPipeError from a closed stdout too
+            _terminate_group(proc)
+            raise
+
+
+async def _run_streaming_async(
+    cmd: list[str],
+    workspace: Path,
+    env: dict,
+    log_fh,
+    timeout: int,
+    input: Union[bytes, Callable[[], bytes], None] = None,
+) -> int:
+    """Async counterpart of _run_streaming using asyncio subprocesses.
 
-            # Append exit code
-            with log_file.open("a") as f:
-                f.write("\n=== Execution completed ===\n")
-                f.write(f"Exit code: {result.returncode}\n")
+    Raises:
+        subprocess.TimeoutExpired: If the child does not exit within timeout
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=workspace,
+        env=env,
+        stdin=asyncio.subprocess.PIPE if input is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+    )
 
-            return ExecutionResult(exit_code=result.returncode)
+    async def feed_stdin(data: bytes) -> None:
+        assert proc.stdin is not None
+        try:
+            proc.stdin.write(data)
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def copy_output() -> None:
+        assert proc.stdout is not None
+        out = sys.stdout.buffer
+        while data := await proc.stdout.read(65536):
+            log_fh.write(data)
+            out.write(data)
+            out.flush()
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    tasks: list[asyncio.Task] = []
 
-        except subprocess.TimeoutExpired:
-            # Log timeout to file (append to preserve tee output)
-            with log_file.open("a") as f:
-                f.write("\n=== Execution timed out ===\n")
-                f.write(f"Status: TIMED OUT after {timeout}s\n")
+    try:
+        # Inside the try, so cancelling during deferred preparation (e.g.
+        # context compilation) still stops the already-spawned backend
+        if callable(input):
+            input = await asyncio.to_thread(input)
+
+        tasks.append(asyncio.create_task(copy_output()))
+        if input is not None:
+            tasks.append(asyncio.create_task(feed_stdin(input)))
+        waiter = asyncio.create_task(proc.wait())
+        tasks.append(waiter)
+
+        # Waiting for EOF as well as exit: orphaned grandchildren may hold the
+        # pipe open after the backend exits, so both are bounded by the same
+        # deadline as the sync loop. A relay error ends the wait early.
+        done, pending = await asyncio.wait(
+            tasks,
+            timeout=max(deadline - loop.time(), 0),
+            return_when=asyncio.FIRST_EXCEPTION,
+        )
+        for task in done:
+            task.result()  # re-raise errors from copy_output/feed_stdin
+        if pending:
+            raise asyncio.TimeoutError
+        returncode = waiter.result()
+    except asyncio.TimeoutError:
+        await _terminate_group_async(proc)
+        # Don't wait forever for output that may never reach EOF
+        _, pending = await asyncio.wait(tasks, timeout=5)
+        for task in pending:
+            task.cancel()
+        raise subprocess.TimeoutExpired(cmd, timeout) from None
+    except BaseException:
+        # Cancellation, or an error from copy_output/feed_stdin
+        await _terminate_group_async(proc)
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return returncode
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_log_dir(log_dir: Path) -> Path:
+    """Create the log directory on first use rather than at import time."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir
+
+
+def _new_log_path(kind: str, run_type: str) -> tuple[str, Path]:
+    """Return the timestamp and global log file path for a new run.
 
-            print(f"ERROR: Execution timed out after {timeout}s", file=sys.stderr)
-            return ExecutionResult(exit_code=124, timed_out=True)
+    Args:
+        kind: Backend prefix for the file name (e.g. "claude-"), empty for gptme
+        run_type: Type of run (for log file naming)
+    """
+    timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime())
+    log_dir = _ensure_log_dir(GLOBAL_LOG_DIR)
+    return timestamp, log_dir / f"{run_type}-{kind}{timestamp}.log"
 
-    finally:
-        # Clean up prompt file
-        if prompt_file.exists():
-            prompt_file.unlink()
 
+def _open_log(spec: "BackendSpec"):
+    """Create spec's log file once for binary appends of header, output and footer.
 
-def execute_claude_code(
+    Names only have one-second resolution, so a run that finds its name taken
+    (e.g. concurrent async runs of the same type) gets a numbered suffix and
+    spec.log_file is updated to match.
+    """
+    base = spec.log_file
+    for n in itertools.count(1):
+        try:
+            log_fd = os.open(
+                spec.log_file,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND,
+                0o644,
+            )
+        except FileExistsError:
+            spec.log_file = base.with_name(f"{base.stem}-{n}{base.suffix}")
+            continue
+        return os.fdopen(log_fd, "wb", buffering=65536)
+
+
+@dataclass(slots=True)
+class BackendSpec:
+    """Everything needed to launch and log one backend run."""
+
+    label: str  # used in the timeout error, e.g. "Codex execution"
+    argv: list[str]
+    stdin: Optional[bytes]
+    env_overlay: dict[str, str]  # merged on top of the base environment
+    log_file: Path
+    header: str
+    # Fills in stdin and header once the backend has been spawned
+    finish_prepare: Optional[Callable[["BackendSpec"], None]] = None
+    # Removed once the run has finished
+    temp_file: Optional[Path] = None
+
+
+def _prepare_gptme(
     prompt: str,
     workspace: Path,
     timeout: int,
-    env: Optional[dict] = None,
-    run_type: str = "run",
-) -> ExecutionResult:
-    """Execute Claude Code with the given prompt.
+    non_interactive: bool,
+    shell_timeout: int,
+    env: Optional[dict],
+    run_type: str,
+    tools: Optional[str],
+) -> "BackendSpec":
+    """Describe a gptme run."""
+    # Create global log file for this run
+    timestamp, log_file = _new_log_path("", run_type)
 
-    Compiles workspace context (static + dynamic) and passes it via
-    --append-system-prompt, mirroring run-with-claude.sh. The prompt
-    itself is piped via stdin.
+    # Build gptme command
+    # Find gptme in PATH (typically pipx-managed)
+    gptme_path = _resolve_executable(
+        "gptme", "gptme not found in PATH. Install with: pipx install gptme"
+    )
+    cmd = [gptme_path]
+    if non_interactive:
+        cmd.append("--non-interactive")
+
+    if tools:
+        cmd.extend(["--tools", tools])
+
+    # gptme treats piped stdin as attached context, not as the prompt, so the
+    # prompt goes in a temporary file outside the workspace. mkstemp creates it
+    # O_EXCL with mode 0o600; the prompt is encoded once and written raw.
+    fd, name = tempfile.mkstemp(prefix="gptme-prompt-", suffix=".txt")
+    prompt_file = Path(name)
+    try:
+        pending = memoryview(prompt.encode("utf-8"))
+        while pending:
+            pending = pending[os.write(fd, pending) :]
+    except BaseException:
+        prompt_file.unlink(missing_ok=True)
+        raise
+    finally:
+        os.close(fd)
 
-    Args:
-        prompt: Prompt text to pass via stdin
-        workspace: Working directory for execution
-        timeout: Maximum execution time in seconds
-        env: Additional environment variables
-        run_type: Type of run (for log file naming)
+    # this line is essential for the prompt file path to not be mistaken for a command
+    cmd.append("'Here is the prompt to follow:'")
 
-    Returns:
-        ExecutionResult with exit code and status
-    """
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    log_file = GLOBAL_LOG_DIR / f"{run_type}-claude-{timestamp}.log"
+    # mentioning the file here includes its contents in the initial message
+    cmd.append(str(prompt_file))
 
-    claude_path = shutil.which("claude")
-    if not claude_path:
-        raise RuntimeError("claude not found in PATH. Install Claude Code CLI first.")
+    # Set up environment
+    env_overlay = {
+        "GPTME_SHELL_TIMEOUT": str(shell_timeout),
+        "GPTME_CHAT_HISTORY": "true",
+        **(env or {}),
+    }
+
+    header = (
+        f"=== {run_type} run at {timestamp} ===\n"
+        f"Working directory: {workspace}\n"
+        f"Command: {' '.join(cmd)}\n"
+        f"Timeout: {timeout}s\n"
+        f"Shell timeout: {shell_timeout}s\n\n"
+        "=== Output ===\n"
+    )
+    return BackendSpec(
+        "Execution", cmd, None, env_overlay, log_file, header, temp_file=prompt_file
+    )
+
+
+def _prepare_claude_code(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    env: Optional[dict],
+    run_type: str,
+) -> "BackendSpec":
+    """Describe a Claude Code run."""
+    timestamp, log_file = _new_log_path("claude-", run_type)
+
+    claude_path = _resolve_executable(
+        "claude", "claude not found in PATH. Install Claude Code CLI first."
+    )
 
     # Compile workspace context (like run-with-claude.sh does)
     context = compile_context(workspace, "Claude Code", "CLAUDE.md")
@@ -237,7 +592,9 @@ def execute_claude_code(
 
     # Pass compiled context as system prompt (like run-with-claude.sh)
     if context:
-        cmd.extend(["--append-system-prompt", context])
+        cmd.extend(
+            ["--append-system-prompt", context.decode("utf-8", errors="replace")]
+        )
 
     # Read config from env (matching shell wrapper exports)
     max_budget = os.environ.get("CLAUDE_MAX_BUDGET_USD")
@@ -253,52 +610,239 @@ def execute_claude_code(
         cmd.extend(["--model", model])
 
     # Set up environment
-    run_env = os.environ.copy()
-    # Ensure Claude's Bash tool gets PATH entries from bashrc
-    run_env["BASH_ENV"] = str(Path.home() / ".bashrc")
-    if env:
-        run_env.update(env)
-
-    # Use pipefail so tee doesn't mask non-zero exit codes
-    cmd_str = shlex.join(cmd)
-    cmd_with_tee = (
-        f"set -o pipefail; {cmd_str} 2>&1 " f"| tee {shlex.quote(str(log_file))}"
+    env_overlay = {
+        # Ensure Claude's Bash tool gets PATH entries from bashrc
+        "BASH_ENV": str(Path.home() / ".bashrc"),
+        **(env or {}),
+    }
+
+    header = (
+        f"=== {run_type} claude-code run at {timestamp} ===\n"
+        f"Working directory: {workspace}\n"
+        f"Command: {shlex.join(cmd)}\n"
+        f"Context compiled: {'yes' if context else 'no'}\n"
+        f"Timeout: {timeout}s\n\n"
+        "=== Output ===\n"
+    )
+    return BackendSpec(
+        "Claude Code execution", cmd, prompt.encode(), env_overlay, log_file, header
     )
 
-    # Write log header
-    with log_file.open("w") as f:
-        f.write(f"=== {run_type} claude-code run at {timestamp} ===\n")
-        f.write(f"Working directory: {workspace}\n")
-        f.write(f"Command: {cmd_str}\n")
-        f.write(f"Context compiled: {'yes' if context else 'no'}\n")
-        f.write(f"Timeout: {timeout}s\n\n")
-        f.write("=== Output ===\n")
 
-    try:
-        result = subprocess.run(
-            ["bash", "-c", cmd_with_tee],
-            cwd=workspace,
-            env=run_env,
-            timeout=timeout,
-            input=prompt,
-            text=True,
-        )
+def _prepare_codex(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    env: Optional[dict],
+    run_type: str,
+) -> "BackendSpec":
+    """Describe a Codex run."""
+    timestamp, log_file = _new_log_path("codex-", run_type)
 
-        with log_file.open("a") as f:
-            f.write("\n=== Execution completed ===\n")
-            f.write(f"Exit code: {result.returncode}\n")
+    # Find codex in PATH or common install locations
+    codex_path = _resolve_executable(
+        "codex",
+        "codex not found in PATH or common install locations.",
+        extra_paths=(
+            Path.home() / ".local" / "bin" / "codex",
+            Path("/usr/local/bin/codex"),
+        ),
+    )
 
-        return ExecutionResult(exit_code=result.returncode)
+    # Build command
+    cmd = [codex_path, "exec", "-C", str(workspace), "--json", "-"]
 
-    except subprocess.TimeoutExpired:
-        with log_file.open("a") as f:
-            f.write("\n=== Execution timed out ===\n")
-            f.write(f"Status: TIMED OUT after {timeout}s\n")
+    sandbox = os.environ.get("CODEX_SANDBOX")
+    if sandbox:
+        cmd.extend(["--sandbox", sandbox])
+    else:
+        cmd.append("--dangerously-bypass-approvals-and-sandbox")
 
-        print(
-            f"ERROR: Claude Code execution timed out after {timeout}s", file=sys.stderr
+    model = os.environ.get("CODEX_MODEL")
+    if model:
+        cmd.extend(["--model", model])
+
+    def compile_prompt(spec: BackendSpec) -> None:
+        # Compile workspace context (like run-with-codex.sh does)
+        context = compile_context(workspace, "Codex", "AGENTS.md")
+
+        # Prepend context to prompt (Codex has no --append-system-prompt)
+        if context:
+            spec.stdin = context + b"\n---\n\n" + prompt.encode()
+        else:
+            spec.stdin = prompt.encode()
+
+        spec.header = (
+            f"=== {run_type} codex run at {timestamp} ===\n"
+            f"Working directory: {workspace}\n"
+            f"Command: {shlex.join(cmd)}\n"
+            f"Context compiled: {'yes' if context else 'no'}\n"
+            f"Timeout: {timeout}s\n\n"
+            "=== Output ===\n"
         )
-        return ExecutionResult(exit_code=124, timed_out=True)
+
+    # The context goes on stdin rather than argv, so compile-context.sh can
+    # run while codex is starting up
+    return BackendSpec(
+        "Codex execution",
+        cmd,
+        b"",
+        env or {},
+        log_file,
+        "",
+        finish_prepare=compile_prompt,
+    )
+
+
+def _finish_log(
+    spec: BackendSpec, log_fh, timeout: int, returncode: Optional[int]
+) -> ExecutionResult:
+    """Write the log footer and build the result; returncode None means timeout."""
+    if returncode is not None:
+        log_fh.write(
+            f"\n=== Execution completed ===\nExit code: {returncode}\n".encode()
+        )
+        return ExecutionResult(exit_code=returncode)
+
+    log_fh.write(
+        f"\n=== Execution timed out ===\nStatus: TIMED OUT after {timeout}s\n".encode()
+    )
+    print(f"ERROR: {spec.label} timed out after {timeout}s", file=sys.stderr)
+    return ExecutionResult(exit_code=124, timed_out=True)
+
+
+def _write_header(spec: BackendSpec, log_fh) -> bytes:
+    """Complete a deferred spec if needed, log its header and return its stdin."""
+    if spec.finish_prepare is not None:
+        spec.finish_prepare(spec)
+    log_fh.write(spec.header.encode())
+    log_fh.flush()
+    return spec.stdin or b""
+
+
+def _backend_input(
+    spec: BackendSpec, log_fh
+) -> Union[bytes, Callable[[], bytes], None]:
+    """Write the header now, or defer it until the backend has been spawned."""
+    if spec.finish_prepare is not None:
+        return lambda: _write_header(spec, log_fh)
+    _write_header(spec, log_fh)
+    return spec.stdin
+
+
+def _remove_temp_file(spec: BackendSpec) -> None:
+    if spec.temp_file is not None:
+        spec.temp_file.unlink(missing_ok=True)
+
+
+def _run_backend(spec: BackendSpec, workspace: Path, timeout: int) -> ExecutionResult:
+    """Run a backend described by spec, streaming output to terminal and log."""
+    run_env = {**_base_env(), **spec.env_overlay}
+
+    # Stream output to both terminal and log file in-process
+    # This gives us real-time journald logging AND complete log file
+    try:
+        with _open_log(spec) as log_fh:
+            stdin = _backend_input(spec, log_fh)
+
+            try:
+                returncode: Optional[int] = _run_streaming(
+                    spec.argv, workspace, run_env, log_fh, timeout, input=stdin
+                )
+            except subprocess.TimeoutExpired:
+                returncode = None
+            return _finish_log(spec, log_fh, timeout, returncode)
+    finally:
+        _remove_temp_file(spec)
+
+
+async def _run_backend_async(
+    spec: BackendSpec, workspace: Path, timeout: int
+) -> ExecutionResult:
+    """Async counterpart of _run_backend."""
+    run_env = {**_base_env(), **spec.env_overlay}
+
+    try:
+        with _open_log(spec) as log_fh:
+            stdin = _backend_input(spec, log_fh)
+
+            try:
+                returncode: Optional[int] = await _run_streaming_async(
+                    spec.argv, workspace, run_env, log_fh, timeout, input=stdin
+                )
+            except subprocess.TimeoutExpired:
+                returncode = None
+            return _finish_log(spec, log_fh, timeout, returncode)
+    finally:
+        _remove_temp_file(spec)
+
+
+def execute_gptme(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    non_interactive: bool = True,
+    shell_timeout: int = 120,
+    env: Optional[dict] = None,
+    run_type: str = "run",
+    tools: Optional[str] = None,
+) -> ExecutionResult:
+    """Execute gptme with the given prompt.
+
+    The prompt is passed as a temporary file in the system temp directory,
+    so nothing is written to the workspace.
+
+    Args:
+        prompt: Prompt text to pass to gptme
+        workspace: Working directory for execution
+        timeout: Maximum execution time in seconds
+        non_interactive: Run in non-interactive mode
+        shell_timeout: Shell command timeout in seconds
+        env: Additional environment variables
+        run_type: Type of run (for log file naming)
+        tools: Tool allowlist string (e.g. "gptodo,save,append")
+
+    Returns:
+        ExecutionResult with exit code and status
+    """
+    spec = _prepare_gptme(
+        prompt,
+        workspace,
+        timeout,
+        non_interactive,
+        shell_timeout,
+        env,
+        run_type,
+        tools,
+    )
+    return _run_backend(spec, workspace, timeout)
+
+
+def execute_claude_code(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    env: Optional[dict] = None,
+    run_type: str = "run",
+) -> ExecutionResult:
+    """Execute Claude Code with the given prompt.
+
+    Compiles workspace context (static + dynamic) and passes it via
+    --append-system-prompt, mirroring run-with-claude.sh. The prompt
+    itself is piped via stdin.
+
+    Args:
+        prompt: Prompt text to pass via stdin
+        workspace: Working directory for execution
+        timeout: Maximum execution time in seconds
+        env: Additional environment variables
+        run_type: Type of run (for log file naming)
+
+    Returns:
+        ExecutionResult with exit code and status
+    """
+    spec = _prepare_claude_code(prompt, workspace, timeout, env, run_type)
+    return _run_backend(spec, workspace, timeout)
 
 
 def execute_codex(
@@ -324,84 +868,57 @@ def execute_codex(
     Returns:
         ExecutionResult with exit code and status
     """
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    log_file = GLOBAL_LOG_DIR / f"{run_type}-codex-{timestamp}.log"
+    spec = _prepare_codex(prompt, workspace, timeout, env, run_type)
+    return _run_backend(spec, workspace, timeout)
 
-    # Find codex in PATH or common install locations
-    codex_path = shutil.which("codex")
-    if not codex_path:
-        for candidate in [
-            Path.home() / ".local" / "bin" / "codex",
-            Path("/usr/local/bin/codex"),
-        ]:
-            if candidate.exists():
-                codex_path = str(candidate)
-                break
-    if not codex_path:
-        raise RuntimeError("codex not found in PATH or common install locations.")
-
-    # Compile workspace context (like run-with-codex.sh does)
-    context = compile_context(workspace, "Codex", "AGENTS.md")
-
-    # Prepend context to prompt (Codex has no --append-system-prompt)
-    if context:
-        combined_prompt = f"{context}\n---\n\n{prompt}"
-    else:
-        combined_prompt = prompt
-
-    # Build command
-    cmd = [codex_path, "exec", "-C", str(workspace), "--json", "-"]
-
-    sandbox = os.environ.get("CODEX_SANDBOX")
-    if sandbox:
-        cmd.extend(["--sandbox", sandbox])
-    else:
-        cmd.append("--dangerously-bypass-approvals-and-sandbox")
 
-    model = os.environ.get("CODEX_MODEL")
-    if model:
-        cmd.extend(["--model", model])
+async def execute_gptme_async(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    non_interactive: bool = True,
+    shell_timeout: int = 120,
+    env: Optional[dict] = None,
+    run_type: str = "run",
+    tools: Optional[str] = None,
+) -> ExecutionResult:
+    """Async variant of execute_gptme.
 
-    # Set up environment
-    run_env = os.environ.copy()
-    if env:
-        run_env.update(env)
-
-    # Use pipefail so tee doesn't mask non-zero exit codes
-    cmd_str = shlex.join(cmd)
-    cmd_with_tee = (
-        f"set -o pipefail; {cmd_str} 2>&1 " f"| tee {shlex.quote(str(log_file))}"
+    Lets callers run backends across several workspaces concurrently, e.g.
+    with ``asyncio.gather`` bounded by an ``asyncio.Semaphore``.
+    """
+    spec = _prepare_gptme(
+        prompt,
+        workspace,
+        timeout,
+        non_interactive,
+        shell_timeout,
+        env,
+        run_type,
+        tools,
     )
+    return await _run_backend_async(spec, workspace, timeout)
 
-    # Write log header
-    with log_file.open("w") as f:
-        f.write(f"=== {run_type} codex run at {timestamp} ===\n")
-        f.write(f"Working directory: {workspace}\n")
-        f.write(f"Command: {cmd_str}\n")
-        f.write(f"Context compiled: {'yes' if context else 'no'}\n")
-        f.write(f"Timeout: {timeout}s\n\n")
-        f.write("=== Output ===\n")
-
-    try:
-        result = subprocess.run(
-            ["bash", "-c", cmd_with_tee],
-            cwd=workspace,
-            env=run_env,
-            timeout=timeout,
-            input=combined_prompt,
-            text=True,
-        )
-
-        with log_file.open("a") as f:
-            f.write("\n=== Execution completed ===\n")
-            f.write(f"Exit code: {result.returncode}\n")
 
-        return ExecutionResult(exit_code=result.returncode)
+async def execute_claude_code_async(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    env: Optional[dict] = None,
+    run_type: str = "run",
+) -> ExecutionResult:
+    """Async variant of execute_claude_code."""
+    spec = _prepare_claude_code(prompt, workspace, timeout, env, run_type)
+    return await _run_backend_async(spec, workspace, timeout)
 
-    except subprocess.TimeoutExpired:
-        with log_file.open("a") as f:
-            f.write("\n=== Execution timed out ===\n")
-            f.write(f"Status: TIMED OUT after {timeout}s\n")
 
-        print(f"ERROR: Codex execution timed out after {timeout}s", file=sys.stderr)
-        return ExecutionResult(exit_code=124, timed_out=True)
+async def execute_codex_async(
+    prompt: str,
+    workspace: Path,
+    timeout: int,
+    env: Optional[dict] = None,
+    run_type: str = "run",
+) -> ExecutionResult:
+    """Async variant of execute_codex."""
+    spec = _prepare_codex(prompt, workspace, timeout, env, run_type)
+    return await _run_backend_async(spec, workspace, timeout)
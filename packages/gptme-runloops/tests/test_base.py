@@ -1,15 +1,38 @@
 """Tests for BaseRunLoop."""
 
 import os
-import tempfile
-from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+import pytest
 
 from gptme_runloops.base import BaseRunLoop
 from gptme_runloops.utils.execution import ExecutionResult
 
 
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a temporary workspace with a logs directory."""
+    (tmp_path / "logs").mkdir()
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def mock_externals(monkeypatch):
+    """Replace the backend executors and git pull for every test."""
+    mocks = SimpleNamespace(
+        gptme=MagicMock(return_value=ExecutionResult(exit_code=0)),
+        claude_code=MagicMock(return_value=ExecutionResult(exit_code=0)),
+        codex=MagicMock(return_value=ExecutionResult(exit_code=0)),
+        git_pull=MagicMock(return_value=True),
+    )
+    monkeypatch.setattr("gptme_runloops.base.execute_gptme", mocks.gptme)
+    monkeypatch.setattr("gptme_runloops.base.execute_claude_code", mocks.claude_code)
+    monkeypatch.setattr("gptme_runloops.base.execute_codex", mocks.codex)
+    monkeypatch.setattr("gptme_runloops.base.git_pull_with_retry", mocks.git_pull)
+    return mocks
+
+
 class TestRunLoop(BaseRunLoop):
     """Concrete test implementation of BaseRunLoop."""
 
@@ -17,250 +40,158 @@ class TestRunLoop(BaseRunLoop):
         return "Test prompt"
 
 
-def test_base_setup():
+def test_base_setup(workspace):
     """Test basic setup process."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
+    run = TestRunLoop(workspace, "test")
 
-        # Setup should succeed
-        assert run.setup()
-        assert run.lock.lock_fd is not None
+    # Setup should succeed
+    assert run.setup()
+    assert run.lock.lock_fd is not None
 
-        # Cleanup
-        run.cleanup()
-        assert run.lock.lock_fd is None
+    # Cleanup
+    run.cleanup()
+    assert run.lock.lock_fd is None
 
 
-def test_base_setup_lock_failure():
+def test_base_setup_lock_failure(workspace):
     """Test setup when lock acquisition fails."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        # First run acquires lock
-        run1 = TestRunLoop(workspace, "test")
-        assert run1.setup()
+    # First run acquires lock
+    run1 = TestRunLoop(workspace, "test")
+    assert run1.setup()
 
-        # Second run fails to acquire lock
-        run2 = TestRunLoop(workspace, "test")
-        assert not run2.setup()
+    # Second run fails to acquire lock
+    run2 = TestRunLoop(workspace, "test")
+    assert not run2.setup()
 
-        # Cleanup
-        run1.cleanup()
+    # Cleanup
+    run1.cleanup()
 
 
-def test_base_pre_run():
+def test_base_pre_run(workspace, mock_externals):
     """Test pre_run git pull."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
+    run = TestRunLoop(workspace, "test")
 
-        # Mock git pull
-        with patch("gptme_runloops.base.git_pull_with_retry") as mock_pull:
-            mock_pull.return_value = True
-            assert run.pre_run()
-            mock_pull.assert_called_once()
+    assert run.pre_run()
+    mock_externals.git_pull.assert_called_once()
 
 
-def test_base_execute():
+def test_base_execute(workspace):
     """Test execute with mock gptme."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
+    run = TestRunLoop(workspace, "test")
 
-        run = TestRunLoop(workspace, "test")
-
-        # Mock gptme execution
-        with patch("gptme_runloops.base.execute_gptme") as mock_execute:
-            mock_execute.return_value = ExecutionResult(exit_code=0)
-
-            result = run.execute("Test prompt")
-            assert result.success
-            assert result.exit_code == 0
+    result = run.execute("Test prompt")
+    assert result.success
+    assert result.exit_code == 0
 
 
-def test_base_run_full_cycle():
+def test_base_run_full_cycle(workspace, mock_externals):
     """Test complete run cycle."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
+    run = TestRunLoop(workspace, "test")
 
-        # Mock all external calls
-        with (
-            patch("gptme_runloops.base.git_pull_with_retry") as mock_pull,
-            patch("gptme_runloops.base.execute_gptme") as mock_execute,
-        ):
-            mock_pull.return_value = True
-            mock_execute.return_value = ExecutionResult(exit_code=0)
+    # Run full cycle
+    exit_code = run.run()
 
-            # Run full cycle
-            exit_code = run.run()
+    assert exit_code == 0
+    mock_externals.git_pull.assert_called_once()
+    mock_externals.gptme.assert_called_once()
 
-            assert exit_code == 0
-            mock_pull.assert_called_once()
-            mock_execute.assert_called_once()
 
-
-def test_base_run_exception_handling():
+def test_base_run_exception_handling(workspace):
     """Test exception handling in run cycle."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
+    run = TestRunLoop(workspace, "test")
 
-        # Mock setup to raise exception
-        with patch.object(run, "setup", side_effect=Exception("Test error")):
-            exit_code = run.run()
+    # Mock setup to raise exception
+    with patch.object(run, "setup", side_effect=Exception("Test error")):
+        exit_code = run.run()
 
-            # Should return error code
-            assert exit_code == 1
-            # Lock should be released in cleanup
-            assert run.lock.lock_fd is None
+        # Should return error code
+        assert exit_code == 1
+        # Lock should be released in cleanup
+        assert run.lock.lock_fd is None
 
 
-def test_backend_defaults_to_gptme():
+def test_backend_defaults_to_gptme(workspace):
     """Test that default backend is gptme."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        # Clear env to ensure default
-        with patch.dict(os.environ, {}, clear=True):
-            run = TestRunLoop(workspace, "test")
-            assert run.backend == "gptme"
+    # Clear env to ensure default
+    with patch.dict(os.environ, {}, clear=True):
+        run = TestRunLoop(workspace, "test")
+        assert run.backend == "gptme"
 
 
-def test_backend_from_env():
+def test_backend_from_env(workspace):
     """Test that backend reads from EXECUTION_BACKEND env var."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        with patch.dict(os.environ, {"EXECUTION_BACKEND": "claude-code"}):
-            run = TestRunLoop(workspace, "test")
-            assert run.backend == "claude-code"
+    with patch.dict(os.environ, {"EXECUTION_BACKEND": "claude-code"}):
+        run = TestRunLoop(workspace, "test")
+        assert run.backend == "claude-code"
 
 
-def test_backend_explicit_overrides_env():
+def test_backend_explicit_overrides_env(workspace):
     """Test that explicit backend param overrides env var."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        with patch.dict(os.environ, {"EXECUTION_BACKEND": "gptme"}):
-            run = TestRunLoop(workspace, "test", backend="codex")
-            assert run.backend == "codex"
+    with patch.dict(os.environ, {"EXECUTION_BACKEND": "gptme"}):
+        run = TestRunLoop(workspace, "test", backend="codex")
+        assert run.backend == "codex"
 
 
-def test_execute_dispatches_to_claude_code():
+def test_execute_dispatches_to_claude_code(workspace, mock_externals):
     """Test that execute dispatches to execute_claude_code for claude-code backend."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test", backend="claude-code")
-
-        with patch("gptme_runloops.base.execute_claude_code") as mock_execute:
-            mock_execute.return_value = ExecutionResult(exit_code=0)
+    run = TestRunLoop(workspace, "test", backend="claude-code")
 
-            result = run.execute("Test prompt")
-            assert result.success
-            mock_execute.assert_called_once_with(
-                prompt="Test prompt",
-                workspace=workspace,
-                timeout=3000,
-                run_type="test",
-            )
+    result = run.execute("Test prompt")
+    assert result.success
+    mock_externals.claude_code.assert_called_once_with(
+        prompt="Test prompt",
+        workspace=workspace,
+        timeout=3000,
+        run_type="test",
+    )
+    mock_externals.gptme.assert_not_called()
 
 
-def test_execute_dispatches_to_codex():
+def test_execute_dispatches_to_codex(workspace, mock_externals):
     """Test that execute dispatches to execute_codex for codex backend."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test", backend="codex")
+    run = TestRunLoop(workspace, "test", backend="codex")
 
-        with patch("gptme_runloops.base.execute_codex") as mock_execute:
-            mock_execute.return_value = ExecutionResult(exit_code=0)
+    result = run.execute("Test prompt")
+    assert result.success
+    mock_externals.codex.assert_called_once_with(
+        prompt="Test prompt",
+        workspace=workspace,
+        timeout=3000,
+        run_type="test",
+    )
+    mock_externals.gptme.assert_not_called()
 
-            result = run.execute("Test prompt")
-            assert result.success
-            mock_execute.assert_called_once_with(
-                prompt="Test prompt",
-                workspace=workspace,
-                timeout=3000,
-                run_type="test",
-            )
 
-
-def test_execute_dispatches_to_gptme_default():
+def test_execute_dispatches_to_gptme_default(workspace, mock_externals):
     """Test that execute dispatches to execute_gptme for default/gptme backend."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test", backend="gptme")
-
-        with patch("gptme_runloops.base.execute_gptme") as mock_execute:
-            mock_execute.return_value = ExecutionResult(exit_code=0)
+    run = TestRunLoop(workspace, "test", backend="gptme")
 
-            result = run.execute("Test prompt")
-            assert result.success
-            mock_execute.assert_called_once()
+    result = run.execute("Test prompt")
+    assert result.success
+    mock_externals.gptme.assert_called_once()
 
 
-def test_skip_execution_env():
+def test_skip_execution_env(workspace, mock_externals, monkeypatch):
     """Test SKIP_EXECUTION=1 skips execution but runs discovery."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
+    monkeypatch.setenv("SKIP_EXECUTION", "1")
+    run = TestRunLoop(workspace, "test")
 
-        with (
-            patch.dict(os.environ, {"SKIP_EXECUTION": "1"}),
-            patch("gptme_runloops.base.git_pull_with_retry") as mock_pull,
-            patch("gptme_runloops.base.execute_gptme") as mock_execute,
-        ):
-            mock_pull.return_value = True
+    exit_code = run.run()
 
-            exit_code = run.run()
+    assert exit_code == 0
+    # execute should NOT have been called
+    mock_externals.gptme.assert_not_called()
+    # but pre_run (git pull) should have been called
+    mock_externals.git_pull.assert_called_once()
 
-            assert exit_code == 0
-            # execute should NOT have been called
-            mock_execute.assert_not_called()
-            # but pre_run (git pull) should have been called
-            mock_pull.assert_called_once()
 
-
-def test_skip_execution_not_set():
+def test_skip_execution_not_set(workspace, mock_externals, monkeypatch):
     """Test that execution proceeds normally when SKIP_EXECUTION is not set."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        workspace = Path(tmpdir)
-        (workspace / "logs").mkdir()
-
-        run = TestRunLoop(workspace, "test")
-
-        with (
-            patch.dict(os.environ, {}, clear=False),
-            patch("gptme_runloops.base.git_pull_with_retry") as mock_pull,
-            patch("gptme_runloops.base.execute_gptme") as mock_execute,
-        ):
-            # Ensure SKIP_EXECUTION is not set
-            os.environ.pop("SKIP_EXECUTION", None)
-            mock_pull.return_value = True
-            mock_execute.return_value = ExecutionResult(exit_code=0)
+    # Ensure SKIP_EXECUTION is not set
+    monkeypatch.delenv("SKIP_EXECUTION", raising=False)
+    run = TestRunLoop(workspace, "test")
 
-            exit_code = run.run()
+    exit_code = run.run()
 
-            assert exit_code == 0
-            mock_execute.assert_called_once()
+    assert exit_code == 0
+    mock_externals.gptme.assert_called_once()
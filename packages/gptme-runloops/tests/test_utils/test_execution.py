@@ -0,0 +1,434 @@
+"""Tests for backend execution utilities."""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from gptme_runloops.utils import execution
+from gptme_runloops.utils.execution import (
+    compile_context,
+    execute_claude_code,
+    execute_codex,
+    execute_codex_async,
+    execute_gptme,
+)
+
+
+def write_fake_backend(bin_dir: Path, name: str, body: str) -> Path:
+    """Write an executable shell script standing in for a backend CLI."""
+    script = bin_dir / name
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return script
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    """Isolate PATH and the global log directory for a test."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(execution, "GLOBAL_LOG_DIR", log_dir)
+    execution._cached_which.cache_clear()
+    execution._base_env.cache_clear()
+    execution._compile_env.cache_clear()
+    return bin_dir, log_dir, workspace
+
+
+def write_compile_script(workspace: Path) -> Path:
+    """Write a compile-context.sh that counts its invocations."""
+    shared = workspace / "scripts" / "shared"
+    shared.mkdir(parents=True)
+    write_fake_backend(
+        shared,
+        "compile-context.sh",
+        'echo run >> runs.txt\nmkdir -p tmp\necho "compiled context" > tmp/full-context.md',
+    )
+    return workspace / "runs.txt"
+
+
+def read_single_log(log_dir: Path) -> str:
+    logs = list(log_dir.glob("*.log"))
+    assert len(logs) == 1
+    return logs[0].read_text()
+
+
+def assert_process_gone(pid: int) -> None:
+    """Wait up to 5s for pid to exit (or be left a zombie)."""
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        status = Path(f"/proc/{pid}/status")
+        if status.exists() and "zombie" in status.read_text():
+            return
+        time.sleep(0.1)
+    pytest.fail(f"process {pid} survived")
+
+
+def test_claude_code_streams_output_to_terminal_and_log(fake_env, capfd):
+    """Output (stdout and stderr) is written to both the terminal and the log."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(bin_dir, "claude", 'cat\necho "to stderr" >&2\nexit 3')
+
+    result = execute_claude_code("hello from stdin", workspace, timeout=10)
+
+    assert result.exit_code == 3
+    assert not result.success
+
+    out = capfd.readouterr().out
+    assert "hello from stdin" in out
+    assert "to stderr" in out
+
+    log = read_single_log(log_dir)
+    assert log.startswith("=== run claude-code run at ")
+    assert "Context compiled: no" in log
+    assert "=== Output ===\nhello from stdin" in log
+    assert "to stderr" in log
+    assert log.endswith("=== Execution completed ===\nExit code: 3\n")
+
+
+def test_claude_code_tolerates_non_utf8_context(fake_env, monkeypatch):
+    """Undecodable compiled context is passed on with replacement characters."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    bin_dir, log_dir, workspace = fake_env
+    shared = workspace / "scripts" / "shared"
+    shared.mkdir(parents=True)
+    write_fake_backend(
+        shared,
+        "compile-context.sh",
+        "mkdir -p tmp\nprintf 'ctx \\377' > tmp/full-context.md",
+    )
+    write_fake_backend(bin_dir, "claude", 'echo "args: $*"')
+
+    result = execute_claude_code("prompt", workspace, timeout=10)
+
+    assert result.success
+    assert "--append-system-prompt ctx \ufffd" in read_single_log(log_dir)
+
+
+def test_codex_receives_prompt_on_stdin(fake_env):
+    """Codex gets the prompt on stdin and its exit code is propagated."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "cat")
+
+    result = execute_codex("codex prompt", workspace, timeout=10, run_type="test")
+
+    assert result.success
+    log = read_single_log(log_dir)
+    assert log.startswith("=== test codex run at ")
+    assert "codex prompt" in log
+    assert "Exit code: 0" in log
+
+
+def test_gptme_receives_prompt_file_argument(fake_env):
+    """gptme gets the prompt as a file argument, removed once the run ends."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(
+        bin_dir,
+        "gptme",
+        'echo "args: $*"\nfor last; do :; done\nstat -c %a "$last"\ncat "$last"',
+    )
+
+    result = execute_gptme("do things ✓", workspace, timeout=10, tools="save")
+
+    assert result.success
+    log = read_single_log(log_dir)
+    assert log.startswith("=== run run at ")
+    assert "Shell timeout: 120s" in log
+    output = log.split("=== Output ===\n", 1)[1]
+    args, mode, prompt = output.split("\n", 3)[:3]
+    assert args.startswith(
+        "args: --non-interactive --tools save 'Here is the prompt to follow:' "
+    )
+    prompt_file = Path(args.rsplit(" ", 1)[1])
+    assert mode == "600"
+    assert prompt == "do things ✓"
+    assert not prompt_file.exists()
+    assert list(workspace.iterdir()) == []
+
+
+def test_timeout_kills_backend(fake_env):
+    """A backend exceeding the timeout is killed and reported as timed out."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "exec sleep 30")
+
+    result = execute_codex("prompt", workspace, timeout=1)
+
+    assert result.timed_out
+    assert result.exit_code == 124
+    assert "Status: TIMED OUT after 1s" in read_single_log(log_dir)
+
+
+def test_executable_lookup_is_cached(fake_env, monkeypatch):
+    """PATH is only walked once per executable unless a refresh is requested."""
+    bin_dir, _, _ = fake_env
+    write_fake_backend(bin_dir, "fake-backend", "exit 0")
+    first = execution._resolve_executable("fake-backend", "missing")
+
+    (bin_dir / "fake-backend").unlink()
+    assert execution._resolve_executable("fake-backend", "missing") == first
+
+    monkeypatch.setenv("GPTME_RUNLOOPS_REFRESH_PATHS", "1")
+    with pytest.raises(RuntimeError, match="missing"):
+        execution._resolve_executable("fake-backend", "missing")
+
+
+def test_compile_context_is_cached_until_inputs_change(tmp_path, monkeypatch):
+    """Unchanged inputs reuse the compiled context without rerunning the script."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    runs = write_compile_script(tmp_path)
+    doc = tmp_path / "CLAUDE.md"
+    doc.write_text("v1")
+
+    assert (
+        compile_context(tmp_path, "Claude Code", "CLAUDE.md") == b"compiled context\n"
+    )
+    assert (
+        compile_context(tmp_path, "Claude Code", "CLAUDE.md") == b"compiled context\n"
+    )
+    assert runs.read_text().count("run") == 1
+
+    os.utime(doc, ns=(0, 0))
+    compile_context(tmp_path, "Claude Code", "CLAUDE.md")
+    assert runs.read_text().count("run") == 2
+
+    # A commit (or any index change) since the last run also invalidates it
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "index").write_bytes(b"")
+    compile_context(tmp_path, "Claude Code", "CLAUDE.md")
+    assert runs.read_text().count("run") == 3
+    (tmp_path / "tasks").mkdir()
+    compile_context(tmp_path, "Claude Code", "CLAUDE.md")
+    assert runs.read_text().count("run") == 4
+
+    monkeypatch.setattr(execution, "CONTEXT_CACHE_TTL", 0)
+    compile_context(tmp_path, "Claude Code", "CLAUDE.md")
+    assert runs.read_text().count("run") == 5
+
+
+def test_env_overrides_are_passed_to_backend(fake_env):
+    """Caller env overrides are merged on top of the base environment."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", 'echo "FOO=$FOO HOME=$HOME"')
+
+    execute_codex("prompt", workspace, timeout=10, env={"FOO": "bar"})
+
+    assert f"FOO=bar HOME={os.environ['HOME']}" in read_single_log(log_dir)
+
+
+def test_async_executors_run_concurrently(fake_env, tmp_path):
+    """Async variants run several workspaces at once and log each run."""
+    bin_dir, log_dir, _ = fake_env
+    write_fake_backend(
+        bin_dir,
+        "codex",
+        "echo start $(date +%s%N)\nsleep 1\necho end $(date +%s%N)\ncat",
+    )
+    workspaces = [tmp_path / "ws-a", tmp_path / "ws-b"]
+    for ws in workspaces:
+        ws.mkdir()
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                execute_codex_async(
+                    f"prompt {ws.name}", ws, timeout=10, run_type=ws.name
+                )
+                for ws in workspaces
+            )
+        )
+
+    results = asyncio.run(run_all())
+
+    assert all(r.success for r in results)
+    logs = {p.name.split("-codex-")[0]: p.read_text() for p in log_dir.glob("*.log")}
+    assert "prompt ws-a" in logs["ws-a"]
+    assert "prompt ws-b" in logs["ws-b"]
+
+    def stamp(log: str, label: str) -> int:
+        return int(log.split(f"\n{label} ", 1)[1].split("\n", 1)[0])
+
+    # Each backend started before the other finished, i.e. the runs overlapped
+    assert stamp(logs["ws-a"], "start") < stamp(logs["ws-b"], "end")
+    assert stamp(logs["ws-b"], "start") < stamp(logs["ws-a"], "end")
+
+
+def test_concurrent_runs_get_separate_logs(fake_env, tmp_path):
+    """Concurrent runs of the same type never share a log file."""
+    bin_dir, log_dir, _ = fake_env
+    write_fake_backend(bin_dir, "codex", "cat")
+    workspaces = [tmp_path / "ws-a", tmp_path / "ws-b"]
+    for ws in workspaces:
+        ws.mkdir()
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                execute_codex_async(f"prompt {ws.name}", ws, timeout=10)
+                for ws in workspaces
+            )
+        )
+
+    asyncio.run(run_all())
+
+    logs = [p.read_text() for p in log_dir.glob("*.log")]
+    assert len(logs) == 2
+    assert all(log.count("=== Output ===") == 1 for log in logs)
+
+
+def test_async_timeout_covers_orphaned_output(fake_env):
+    """An async run whose grandchild keeps stdout open still honours the timeout."""
+    bin_dir, _, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "sleep 4 &\nexit 0")
+
+    start = time.monotonic()
+    result = asyncio.run(execute_codex_async("prompt", workspace, timeout=1))
+
+    assert result.timed_out
+    assert time.monotonic() - start < 3
+
+
+def test_log_dir_is_created_on_first_run(fake_env, tmp_path, monkeypatch):
+    """The global log directory is created lazily, not at import time."""
+    bin_dir, _, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "exit 0")
+    log_dir = tmp_path / "nested" / "logs"
+    monkeypatch.setattr(execution, "GLOBAL_LOG_DIR", log_dir)
+
+    execute_codex("prompt", workspace, timeout=10)
+
+    assert "Exit code: 0" in read_single_log(log_dir)
+
+
+def test_large_prompt_does_not_deadlock(fake_env):
+    """Prompts larger than the pipe buffer are fed while output is drained."""
+    bin_dir, log_dir, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "cat")
+    prompt = "x" * (1 << 20)
+
+    result = execute_codex(prompt, workspace, timeout=10)
+
+    assert result.success
+    assert prompt in read_single_log(log_dir)
+
+
+def test_codex_prepends_compiled_context(fake_env, monkeypatch):
+    """Compiled context bytes are prepended to the Codex prompt on stdin."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    bin_dir, log_dir, workspace = fake_env
+    write_compile_script(workspace)
+    write_fake_backend(bin_dir, "codex", "cat")
+
+    execute_codex("codex prompt", workspace, timeout=10)
+
+    log = read_single_log(log_dir)
+    assert "Context compiled: yes" in log
+    assert "compiled context\n\n---\n\ncodex prompt" in log
+
+
+class _ClosedPipe:
+    def write(self, data):
+        raise BrokenPipeError
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize("run_async", [False, True], ids=["sync", "async"])
+def test_output_error_stops_backend(fake_env, monkeypatch, run_async):
+    """An error while relaying output terminates the backend instead of waiting."""
+    bin_dir, _, workspace = fake_env
+    write_fake_backend(bin_dir, "codex", "echo hello\nexec sleep 30")
+    monkeypatch.setattr(sys, "stdout", SimpleNamespace(buffer=_ClosedPipe()))
+
+    start = time.monotonic()
+    with pytest.raises(BrokenPipeError):
+        if run_async:
+            asyncio.run(execute_codex_async("prompt", workspace, timeout=10))
+        else:
+            execute_codex("prompt", workspace, timeout=10)
+
+    assert time.monotonic() - start < 5
+
+
+def test_timeout_stops_backend_process_group(fake_env):
+    """Processes spawned by the backend are terminated along with it on timeout."""
+    bin_dir, _, workspace = fake_env
+    pid_file = workspace / "grandchild.pid"
+    write_fake_backend(bin_dir, "codex", f"sleep 30 &\necho $! > {pid_file}\nwait")
+
+    result = execute_codex("prompt", workspace, timeout=1)
+
+    assert result.timed_out
+    assert_process_gone(int(pid_file.read_text()))
+
+
+def test_async_cancel_during_compile_stops_backend(fake_env, monkeypatch):
+    """Cancelling while context compiles terminates the already-spawned backend."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    bin_dir, _, workspace = fake_env
+    shared = workspace / "scripts" / "shared"
+    shared.mkdir(parents=True)
+    write_fake_backend(shared, "compile-context.sh", "sleep 2")
+    pid_file = workspace / "codex.pid"
+    write_fake_backend(bin_dir, "codex", f"echo $$ > {pid_file}\ncat")
+
+    async def cancel_early():
+        await asyncio.wait_for(
+            execute_codex_async("prompt", workspace, timeout=10), timeout=0.5
+        )
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(cancel_early())
+
+    assert_process_gone(int(pid_file.read_text()))
+
+
+def test_codex_starts_while_context_compiles(fake_env, monkeypatch):
+    """Codex is spawned before compile-context.sh runs and still gets the context."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    bin_dir, log_dir, workspace = fake_env
+    shared = workspace / "scripts" / "shared"
+    shared.mkdir(parents=True)
+    write_fake_backend(
+        shared,
+        "compile-context.sh",
+        "sleep 0.5\nmkdir -p tmp\necho ctx > tmp/full-context.md\ntouch compiled",
+    )
+    write_fake_backend(bin_dir, "codex", "test -e compiled || echo started early\ncat")
+
+    execute_codex("prompt", workspace, timeout=10)
+
+    log = read_single_log(log_dir)
+    assert "Context compiled: yes\n" in log
+    assert "=== Output ===\nstarted early\nctx\n\n---\n\nprompt" in log
+
+
+def test_compile_context_gets_minimal_env(tmp_path, monkeypatch):
+    """compile-context.sh only sees the whitelisted environment variables."""
+    monkeypatch.setattr(execution, "_context_cache", {})
+    monkeypatch.setenv("SECRET_TOKEN", "hunter2")
+    execution._compile_env.cache_clear()
+    shared = tmp_path / "scripts" / "shared"
+    shared.mkdir(parents=True)
+    write_fake_backend(
+        shared,
+        "compile-context.sh",
+        'mkdir -p tmp\necho "token=$SECRET_TOKEN home=$HOME" > tmp/full-context.md',
+    )
+
+    context = compile_context(tmp_path, "Codex", "AGENTS.md")
+
+    assert context == f"token= home={os.environ['HOME']}\n".encode()
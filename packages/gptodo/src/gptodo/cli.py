@@ -23,15 +23,19 @@ Features:
 import json
 import logging
 import os
+import re
 import sys
 from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
     Optional,
     Set,
+    Tuple,
 )
 
 import click
@@ -45,6 +49,7 @@ from tabulate import tabulate
 from gptodo.utils import (
     # Data classes
     DirectoryConfig,
+    SubtaskCount,
     TaskInfo,
     # Constants
     CONFIGS,
@@ -660,34 +665,127 @@ def list_(sort, active_only, context, project, output_json, output_jsonl):
     console.print(f"\nTotal: {len(tasks)} tasks ({', '.join(summary)})")
 
 
+_BROWSE_DEFAULT_STATE_SET = frozenset(BROWSE_DEFAULT_STATES)
+
+# browse-list --sort modes: (key function, reverse)
+_BROWSE_SORT_KEYS: Dict[str, Tuple[Callable[[TaskInfo], Any], bool]] = {
+    "date": (attrgetter("created"), False),
+    "priority": (lambda t: (-t.priority_rank, t.name), False),
+    "modified": (attrgetter("modified"), True),
+    "name": (attrgetter("name"), False),
+}
+
+# Frontmatter fields browse-list needs; anything else in the header is skipped
+_BROWSE_HEADER_RE = re.compile(r"(state|priority|project|created|modified):[ \t]*(.*)")
+
+
+def _parse_header_fast(path: Path) -> Optional[Dict[str, Optional[str]]]:
+    """Read the browse-list fields from a task file's frontmatter header.
+
+    Only reads up to the closing ``---`` and handles plain or quoted scalars.
+    Returns None if the header is missing, unterminated, or uses YAML syntax
+    this parser doesn't understand, so the caller can fall back to a full load.
+    """
+    fields: Dict[str, Optional[str]] = {}
+    with open(path, encoding="utf-8") as f:
+        if f.readline().rstrip() != "---":
+            return None
+        for line in f:
+            if line.rstrip() == "---":
+                return fields
+            match = _BROWSE_HEADER_RE.match(line)
+            if not match:
+                continue
+            value = match.group(2).strip()
+            if value[:1] in ("'", '"'):
+                if len(value) < 2 or value[-1] != value[0]:
+                    return None
+                fields[match.group(1)] = value[1:-1]
+            elif value in ("", "~", "null"):
+                fields[match.group(1)] = None
+            elif value[:1] in ("[", "{", "|", ">", "&", "*", "!") or " #" in value:
+                return None
+            else:
+                fields[match.group(1)] = value
+    return None
+
+
+def _load_browse_tasks(tasks_dir: Path) -> List[TaskInfo]:
+    """Load tasks for browse-list from their headers only.
+
+    Files whose header can't be parsed by ``_parse_header_fast``, or that lack
+    a parseable ``created`` date, go through ``load_tasks`` instead so the
+    git/ctime fallbacks and error handling stay identical.
+    """
+    tasks: List[TaskInfo] = []
+    for file in tasks_dir.glob("*.md"):
+        try:
+            fields = _parse_header_fast(file)
+            if fields is None or not fields.get("created"):
+                raise ValueError("needs full load")
+            created = datetime.fromisoformat(fields["created"] or "")
+            if fields.get("modified"):
+                modified = datetime.fromisoformat(fields["modified"] or "")
+            else:
+                modified = datetime.fromtimestamp(file.stat().st_mtime)
+        except (OSError, UnicodeDecodeError, ValueError):
+            tasks.extend(load_tasks(tasks_dir, single_file=file))
+            continue
+
+        if created.tzinfo:
+            created = created.astimezone().replace(tzinfo=None)
+        if modified.tzinfo:
+            modified = modified.astimezone().replace(tzinfo=None)
+        state = fields.get("state")
+        tasks.append(
+            TaskInfo(
+                path=file,
+                name=file.stem,
+                state=normalize_state(state, warn=False) if state else "backlog",
+                created=created,
+                modified=modified,
+                priority=fields.get("priority"),
+                tags=[],
+                depends=[],
+                requires=[],
+                related=[],
+                parent=None,
+                discovered_from=[],
+                subtasks=SubtaskCount(0, 0),
+                issues=[],
+                metadata=fields,
+                project=fields.get("project"),
+            )
+        )
+    return tasks
+
+
 def _get_browse_lines(tasks_dir, sort_key="date", filter_state=None, project=None, show_all=False):
     """Get formatted task lines for fzf consumption.
 
     Returns space-padded aligned lines with a header row first:
     NAME  STATE  PRI  PROJECT  CREATED
     """
-    tasks = load_tasks(tasks_dir)
+    tasks = _load_browse_tasks(tasks_dir)
     if not tasks:
         return []
 
-    # Filter
+    # Filter (state and project in a single pass)
+    states: Optional[Set[str]] = None
     if filter_state:
-        normalized_state = _normalize_browse_state(filter_state)
-        tasks = [t for t in tasks if t.state == normalized_state]
+        states = {_normalize_browse_state(filter_state)}
     elif not show_all:
-        tasks = [t for t in tasks if t.state in BROWSE_DEFAULT_STATES]
-    if project:
-        tasks = [t for t in tasks if t.project == project]
+        states = _BROWSE_DEFAULT_STATE_SET
+    if states is not None or project:
+        tasks = [
+            t
+            for t in tasks
+            if (states is None or t.state in states) and (not project or t.project == project)
+        ]
 
     # Sort
-    if sort_key == "priority":
-        tasks.sort(key=lambda t: (-t.priority_rank, t.name))
-    elif sort_key == "modified":
-        tasks.sort(key=lambda t: t.modified, reverse=True)
-    elif sort_key == "name":
-        tasks.sort(key=lambda t: t.name)
-    else:  # date
-        tasks.sort(key=lambda t: t.created)
+    key, reverse = _BROWSE_SORT_KEYS.get(sort_key, _BROWSE_SORT_KEYS["date"])
+    tasks.sort(key=key, reverse=reverse)
 
     if not tasks:
         return []
@@ -984,13 +1082,56 @@ def _fzf_version() -> tuple[int, ...]:
         return (0, 0, 0)
 
 
+# Keyboard hints in border label (spans full window width)
+_FZF_BORDER_LABEL = " ? Actions │ ^S Sort │ ^F Filter │ ^T State │ ^A Auto │ ^E Edit │ ^B Blame │ ^L Log │ ^P Preview │ ^R Raw │ ^W Layout "
+
+# fzf arguments that don't depend on the repo or the per-session state dir
+_FZF_STATIC_ARGS = (
+    "fzf",
+    "--preview",
+    "gptodo show --render {1}",
+    "--preview-window",
+    "down:75%:wrap",
+    "--preview-label",
+    " Task Preview ",
+    "--layout",
+    "reverse",
+    "--border",
+    "rounded",
+    "--ansi",
+    "--no-sort",
+    "--header-lines",
+    "1",
+    "--border-label",
+    _FZF_BORDER_LABEL,
+    "--border-label-pos",
+    "0:bottom",
+)
+_FZF_STATIC_BINDINGS = (
+    "ctrl-p:change-preview(gptodo show --render {1})+change-preview-label( Task Preview )",
+    "ctrl-r:change-preview(gptodo show {1})+change-preview-label( Raw Markdown )",
+    "ctrl-w:change-preview-window(right:60%:wrap|down:75%:wrap)+refresh-preview",
+    "ctrl-/:toggle-preview",
+)
+
+
+def _run_fzf(cmd, input_text):
+    """Run fzf on the given lines and return the completed process.
+
+    Only stdout is captured (for the selection); stderr stays on the terminal
+    so fzf can render its TUI via /dev/tty or the stderr fallback.
+    """
+    import subprocess
+
+    return subprocess.run(cmd, input=input_text, stdout=subprocess.PIPE, text=True)
+
+
 def _browse_fzf(repo_root, show_all=False, project=None, filter_state=None):
     """Browse tasks interactively using fzf with full TUI.
 
     Features: command palette (?), sort/filter pickers, state/autonomy changes,
     git blame/log in preview, editor integration.
     """
-    import subprocess
     import tempfile
 
     tasks_dir = repo_root / "tasks"
@@ -1016,9 +1157,6 @@ def _browse_fzf(repo_root, show_all=False, project=None, filter_state=None):
         # Write helper scripts
         _write_browse_scripts(state_dir, repo_root)
 
-        # Keyboard hints in border label (spans full window width)
-        border_label = " ? Actions │ ^S Sort │ ^F Filter │ ^T State │ ^A Auto │ ^E Edit │ ^B Blame │ ^L Log │ ^P Preview │ ^R Raw │ ^W Layout "
-
         # Reload command (reads state files, calls browse-list)
         reload_cmd = f"sh {state_dir}/reload.sh"
 
@@ -1032,47 +1170,15 @@ def _browse_fzf(repo_root, show_all=False, project=None, filter_state=None):
             f"ctrl-e:execute(sh {state_dir}/edit-task.sh {repo_root}/tasks/{{1}}.md)+reload({reload_cmd})",
             f"ctrl-b:change-preview(git -C {repo_root} blame --date=short -- tasks/{{1}}.md)+change-preview-label( Git Blame )",
             f"ctrl-l:change-preview(git -C {repo_root} log --follow --oneline --color -- tasks/{{1}}.md)+change-preview-label( Git Log )",
-            "ctrl-p:change-preview(gptodo show --render {1})+change-preview-label( Task Preview )",
-            "ctrl-r:change-preview(gptodo show {1})+change-preview-label( Raw Markdown )",
-            "ctrl-w:change-preview-window(right:60%:wrap|down:75%:wrap)+refresh-preview",
-            "ctrl-/:toggle-preview",
+            *_FZF_STATIC_BINDINGS,
         ]
         # resize event requires fzf >= 0.42.0
         if _fzf_version() >= (0, 42, 0):
             bind_list.append("resize:refresh-preview")
         bindings = ",".join(bind_list)
 
-        # Run fzf with full TUI.
-        # Only capture stdout (for the selection); let stderr go to the
-        # terminal so fzf can render its TUI via /dev/tty or stderr fallback.
-        result = subprocess.run(
-            [
-                "fzf",
-                "--preview",
-                "gptodo show --render {1}",
-                "--preview-window",
-                "down:75%:wrap",
-                "--preview-label",
-                " Task Preview ",
-                "--layout",
-                "reverse",
-                "--border",
-                "rounded",
-                "--ansi",
-                "--no-sort",
-                "--header-lines",
-                "1",
-                "--border-label",
-                border_label,
-                "--border-label-pos",
-                "0:bottom",
-                "--bind",
-                bindings,
-            ],
-            input=input_text,
-            stdout=subprocess.PIPE,
-            text=True,
-        )
+        # Run fzf with full TUI
+        result = _run_fzf([*_FZF_STATIC_ARGS, "--bind", bindings], input_text)
 
         if result.returncode == 2:
             # fzf error (bad flags, etc.) — report to stderr (which is the terminal)
@@ -0,0 +1,7 @@
+"""Pytest configuration for gptodo tests."""
+
+
+def pytest_configure(config):
+    """Configure pytest markers."""
+    # Registered here so the marker is known even without pytest-xdist installed
+    config.addinivalue_line("markers", "xdist_group(name): run tests on the same xdist worker")
@@ -1,16 +1,88 @@
 """Tests for the gptodo browse command."""
 
-import subprocess
+import copy
+import functools
+import io
+import os
 import time
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import frontmatter
+import pytest
 from click.testing import CliRunner
 
-from gptodo.cli import cli, _get_browse_lines, _write_browse_scripts
+from gptodo.cli import (
+    browse,
+    cli,
+    show,
+    _get_browse_lines,
+    _load_browse_tasks,
+    _write_browse_scripts,
+)
 from gptodo.utils import load_tasks as load_tasks_util
 
+# Keep this module on one xdist worker so tasks_dir_factory's per-process cache
+# is shared by all of its tests under `pytest -n auto --dist loadgroup`.
+pytestmark = pytest.mark.xdist_group(name="gptodo_browse")
+
+
+@functools.lru_cache(maxsize=128)
+def _task_payload(
+    state: str,
+    priority: str = "medium",
+    project: str | None = None,
+    content: str = "Task body content.",
+    created: str | None = None,
+    extra_meta: tuple[tuple[str, str], ...] = (),
+) -> bytes:
+    """Encode a task file with a hand-written YAML frontmatter header.
+
+    Values are plain scalars, with ``created`` quoted so it is read back as a
+    string rather than a date. Memoized, since most tests write identical
+    bodies under different file names; ``extra_meta`` is a tuple of items so
+    the arguments stay hashable.
+    """
+    lines = ["---", f"state: {state}", f"priority: {priority}"]
+    if project:
+        lines.append(f"project: {project}")
+    if created:
+        lines.append(f"created: '{created}'")
+    if extra_meta:
+        lines.extend(f"{key}: {value}" for key, value in extra_meta)
+    lines += ["---", "", content]
+    return "\n".join(lines).encode()
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> None:
+    """Create ``path`` (and parents) once; later calls for the same path are free."""
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _write_task_file(task_file: Path, payload: bytes) -> None:
+    fd = os.open(task_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
+
+def create_tasks_bulk(tasks_dir: Path, specs) -> list[Path]:
+    """Create several task files at once.
+
+    Each spec is a tuple of positional ``create_task`` arguments after
+    ``tasks_dir``: ``(name, state[, priority[, project[, content]]])``.
+    """
+    _ensure_dir(tasks_dir)
+    files = [(tasks_dir / f"{name}.md", _task_payload(*rest)) for name, *rest in specs]
+    for task_file, payload in files:
+        _write_task_file(task_file, payload)
+    return [task_file for task_file, _ in files]
+
 
 def create_task(
     tasks_dir: Path,
@@ -22,191 +94,299 @@ def create_task(
     created: str | None = None,
     extra_meta: dict | None = None,
 ):
-    """Helper to create a task markdown file with frontmatter."""
-    meta = {"state": state, "priority": priority}
-    if project:
-        meta["project"] = project
-    if created:
-        meta["created"] = created
-    if extra_meta:
-        meta.update(extra_meta)
-    post = frontmatter.Post(content, **meta)
+    """Helper to create a task markdown file with frontmatter, creating ``tasks_dir`` if needed."""
+    _ensure_dir(tasks_dir)
     task_file = tasks_dir / f"{name}.md"
-    task_file.write_text(frontmatter.dumps(post))
+    _write_task_file(
+        task_file,
+        _task_payload(
+            state, priority, project, content, created, tuple((extra_meta or {}).items())
+        ),
+    )
     return task_file
 
 
-def _fzf_side_effect(mock_result):
-    """Create a side_effect function that intercepts fzf subprocess calls."""
-    original_run = subprocess.run
-
-    def side_effect(*args, **kwargs):
-        cmd = args[0] if args else kwargs.get("args", [])
-        if isinstance(cmd, list) and cmd and cmd[0] == "fzf":
-            return mock_result
-        return original_run(*args, **kwargs)
+@pytest.fixture(scope="session")
+def tasks_dir_factory(tmp_path_factory):
+    """Build read-only tasks directories once per session, keyed by their task specs.
 
-    return side_effect
+    Each spec is a tuple of positional ``create_task`` arguments after
+    ``tasks_dir``, e.g. ``("task-gptme", "active", "medium", "gptme")``. Tests
+    that modify tasks should copy the result (``shutil.copytree``) into
+    ``tmp_path`` first.
 
+    Directories live under ``tmp_path_factory``'s worker-local base temp and the
+    cache is per process, so reuse happens between tests on the same xdist
+    worker, not across workers.
+    """
+    cache: dict[tuple, Path] = {}
+
+    def make(*specs: tuple) -> Path:
+        if specs not in cache:
+            tasks_dir = tmp_path_factory.mktemp("task-set") / "tasks"
+            create_tasks_bulk(tasks_dir, specs)
+            _SESSION_TASK_DIRS.add(tasks_dir)
+            cache[specs] = tasks_dir
+        return cache[specs]
+
+    return make
+
+
+# Read-only directories built by tasks_dir_factory; only their files are cached
+_SESSION_TASK_DIRS: set[Path] = set()
+_POST_CACHE: dict[tuple[Path, int, int, int], frontmatter.Post] = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cached_frontmatter_load():
+    """Memoize ``frontmatter.load`` for files in session task directories.
+
+    Those directories are parsed by many tests; each caller gets a fresh
+    ``Post`` with a deep-copied metadata dict so in-place edits don't leak.
+    Files in per-test directories, which tests may rewrite, always go to the
+    real loader.
+    """
+    real_load = frontmatter.load
 
-def _get_fzf_calls(mock_run):
-    """Extract fzf calls from a mock subprocess.run."""
-    return [
-        c
-        for c in mock_run.call_args_list
-        if isinstance(c[0][0], list) and c[0][0][0] == "fzf" and c[0][0][1:] != ["--version"]
-    ]
+    def load(fd, *args, **kwargs):
+        if args or kwargs or not isinstance(fd, (str, Path)):
+            return real_load(fd, *args, **kwargs)
+        path = Path(fd)
+        if path.parent not in _SESSION_TASK_DIRS:
+            return real_load(path)
+        st = path.stat()
+        key = (path, st.st_mtime_ns, st.st_size, st.st_ino)
+        if key not in _POST_CACHE:
+            _POST_CACHE[key] = real_load(path)
+        post = _POST_CACHE[key]
+        return frontmatter.Post(post.content, post.handler, **copy.deepcopy(post.metadata))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(frontmatter, "load", load)
+        yield
+    _POST_CACHE.clear()
+
+
+@pytest.fixture(scope="session")
+def canonical_tasks_dir(tasks_dir_factory):
+    """Shared read-only tasks directory with one task per common state."""
+    return tasks_dir_factory(
+        ("t-active", "active"),
+        ("t-backlog", "backlog"),
+        ("t-todo", "todo"),
+        ("t-review", "ready_for_review"),
+        ("t-done", "done"),
+    )
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """CliRunner shared by every test in this module.
+
+    NO_COLOR and TERM=dumb keep Rich/Click from emitting ANSI styling, so the
+    captured output stays small and plain.
+    """
+    return CliRunner(env={"NO_COLOR": "1", "TERM": "dumb"})
+
+
+@dataclass
+class _FakeCompleted:
+    """The parts of ``subprocess.CompletedProcess`` that ``_browse_fzf`` reads."""
+
+    returncode: int = 130  # User cancelled with Esc
+    stdout: str = ""
+
+
+@dataclass
+class _FakeFzf:
+    """Stand-in for ``gptodo.cli._run_fzf`` that records each fzf argv."""
+
+    result: _FakeCompleted = field(default_factory=_FakeCompleted)
+    calls: list[list[str]] = field(default_factory=list)
+
+    def __call__(self, cmd, input_text):
+        self.calls.append(cmd)
+        return self.result
+
+
+@contextmanager
+def fzf_harness(tasks_dir=None):
+    """Report fzf as installed and fake ``gptodo.cli._run_fzf`` for the block.
+
+    Yields the ``_FakeFzf`` so callers can inspect ``calls``. fzf answers as if
+    the user pressed Esc; set ``result`` for a different outcome. If given,
+    ``tasks_dir`` is exported as ``GPTODO_TASKS_DIR`` for the same scope.
+    """
+    fake_fzf = _FakeFzf()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("shutil.which", lambda name: "/usr/bin/fzf")
+        mp.setattr("gptodo.cli._run_fzf", fake_fzf)
+        if tasks_dir is not None:
+            mp.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        yield fake_fzf
+
+
+@pytest.fixture
+def fzf_patched():
+    """Per-test ``fzf_harness``; returns the ``_FakeFzf``."""
+    with fzf_harness() as fake_fzf:
+        yield fake_fzf
+
+
+@pytest.fixture(scope="module")
+def fzf_cmd(tasks_dir_factory, runner):
+    """Invoke browse once in fzf mode and return the fzf argv it built."""
+    with fzf_harness(tasks_dir_factory(("my-task", "active"))) as fake_fzf:
+        runner.invoke(browse, [])
+    (argv,) = fake_fzf.calls
+    return argv
+
+
+def run_browse(tasks_dir, show_all=False, project=None, filter_state=None, no_fzf=True):
+    """Call the browse callback in-process, skipping Click argument parsing.
+
+    ``tasks_dir`` is exposed to the command through ``GPTODO_TASKS_DIR`` only
+    for the duration of the call.
+
+    Returns an object with ``output`` and ``exit_code`` like a CliRunner result.
+    """
+    buf = io.StringIO()
+    exit_code = 0
+    with (
+        patch.dict(os.environ, {"GPTODO_TASKS_DIR": str(tasks_dir)}),
+        redirect_stdout(buf),
+    ):
+        try:
+            browse.callback(
+                show_all=show_all, project=project, filter_state=filter_state, no_fzf=no_fzf
+            )
+        except SystemExit as e:
+            exit_code = e.code or 0
+    return SimpleNamespace(output=buf.getvalue(), exit_code=exit_code)
 
 
 def _get_fzf_arg(fzf_cmd, arg_name):
     """Extract the value of a specific fzf argument from the command list."""
-    for i, a in enumerate(fzf_cmd):
-        if a == arg_name and i + 1 < len(fzf_cmd):
-            return fzf_cmd[i + 1]
-    return None
+    try:
+        return fzf_cmd[fzf_cmd.index(arg_name) + 1]
+    except (ValueError, IndexError):
+        return None
 
 
 class TestBrowseNoTasks:
     """Test browse with no tasks available."""
 
-    def test_browse_no_tasks_dir(self, tmp_path, monkeypatch):
+    def test_browse_no_tasks_dir(self, tmp_path):
         """Should show error when no tasks directory exists."""
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tmp_path / "tasks"))
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--no-fzf"])
+        result = run_browse(tmp_path / "tasks")
         assert result.exit_code == 0
         assert "No tasks found" in result.output
 
-    def test_browse_empty_tasks_dir(self, tmp_path, monkeypatch):
+    def test_browse_empty_tasks_dir(self, tasks_dir_factory):
         """Should show error when tasks directory is empty."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--no-fzf"])
+        result = run_browse(tasks_dir_factory())
         assert result.exit_code == 0
         assert "No tasks found" in result.output
 
 
-class TestBrowseDefaultFilter:
-    """Test that browse defaults to current open-work states."""
-
-    def test_browse_active_only_default(self, tmp_path, monkeypatch):
-        """Default browse should show current open-work states."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-backlog", "backlog")
-        create_task(tasks_dir, "task-todo", "todo")
-        create_task(tasks_dir, "task-review", "ready_for_review")
-        create_task(tasks_dir, "task-waiting", "waiting")
-        create_task(tasks_dir, "task-paused", "paused")
-        create_task(tasks_dir, "task-done", "done")
-        create_task(tasks_dir, "task-cancelled", "cancelled")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--no-fzf"])
-        assert "task-active" in result.output
-        assert "task-backlog" in result.output
-        assert "task-todo" in result.output
-        assert "task-review" in result.output
-        assert "task-waiting" in result.output
-        assert "task-paused" not in result.output
-        assert "task-done" not in result.output
-        assert "task-cancelled" not in result.output
-
-
-class TestBrowseAllFlag:
-    """Test --all flag includes done/cancelled tasks."""
-
-    def test_browse_all_flag(self, tmp_path, monkeypatch):
-        """--all should include done and cancelled tasks."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-done", "done")
-        create_task(tasks_dir, "task-cancelled", "cancelled")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--all", "--no-fzf"])
-        assert "task-active" in result.output
-        assert "task-done" in result.output
-        assert "task-cancelled" in result.output
+class TestBrowseFilters:
+    """Test the default, --all, --project and --state filters."""
+
+    @pytest.mark.parametrize(
+        "kwargs,tasks,present,absent",
+        [
+            (
+                {},
+                (
+                    ("task-active", "active"),
+                    ("task-backlog", "backlog"),
+                    ("task-todo", "todo"),
+                    ("task-review", "ready_for_review"),
+                    ("task-waiting", "waiting"),
+                    ("task-paused", "paused"),
+                    ("task-done", "done"),
+                    ("task-cancelled", "cancelled"),
+                ),
+                ["task-active", "task-backlog", "task-todo", "task-review", "task-waiting"],
+                ["task-paused", "task-done", "task-cancelled"],
+            ),
+            (
+                {"show_all": True},
+                (
+                    ("task-active", "active"),
+                    ("task-done", "done"),
+                    ("task-cancelled", "cancelled"),
+                ),
+                ["task-active", "task-done", "task-cancelled"],
+                [],
+            ),
+            (
+                {"project": "gptme"},
+                (
+                    ("task-gptme", "active", "medium", "gptme"),
+                    ("task-other", "active", "medium", "other"),
+                    ("task-none", "active"),
+                ),
+                ["task-gptme"],
+                ["task-other", "task-none"],
+            ),
+            (
+                {"filter_state": "active"},
+                (
+                    ("task-active", "active"),
+                    ("task-backlog", "backlog"),
+                    ("task-waiting", "waiting"),
+                ),
+                ["task-active"],
+                ["task-backlog", "task-waiting"],
+            ),
+        ],
+        ids=["default", "all", "project", "state"],
+    )
+    def test_browse_filters(self, tasks_dir_factory, kwargs, tasks, present, absent):
+        """Each filter should show only the matching tasks."""
+        tasks_dir = tasks_dir_factory(*tasks)
+
+        out = run_browse(tasks_dir, **kwargs).output
+        assert all(name in out for name in present)
+        assert not any(name in out for name in absent)
 
 
 class TestBrowseProjectFilter:
     """Test --project filter."""
 
-    def test_browse_project_filter(self, tmp_path, monkeypatch):
-        """--project should only show tasks from that project."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-gptme", "active", project="gptme")
-        create_task(tasks_dir, "task-other", "active", project="other")
-        create_task(tasks_dir, "task-none", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--project", "gptme", "--no-fzf"])
-        assert "task-gptme" in result.output
-        assert "task-other" not in result.output
-        assert "task-none" not in result.output
-
-    def test_browse_project_no_match(self, tmp_path, monkeypatch):
+    def test_browse_project_no_match(self, tasks_dir_factory):
         """--project with no matches should show message."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-other", "active", project="other")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        tasks_dir = tasks_dir_factory(("task-other", "active", "medium", "other"))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--project", "nonexistent", "--no-fzf"])
+        result = run_browse(tasks_dir, project="nonexistent")
         assert "No tasks found" in result.output or "no" in result.output.lower()
 
 
 class TestBrowseStateFilter:
     """Test --state filter."""
 
-    def test_browse_state_filter(self, tmp_path, monkeypatch):
-        """--state should only show tasks with that state."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-backlog", "backlog")
-        create_task(tasks_dir, "task-waiting", "waiting")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--state", "active", "--no-fzf"])
-        assert "task-active" in result.output
-        assert "task-backlog" not in result.output
-        assert "task-waiting" not in result.output
-
-    def test_browse_state_filter_ready_for_review(self, tmp_path, monkeypatch):
+    def test_browse_state_filter_ready_for_review(self, tasks_dir_factory):
         """--state should accept ready_for_review."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-review", "ready_for_review")
-        create_task(tasks_dir, "task-active", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        tasks_dir = tasks_dir_factory(
+            ("task-review", "ready_for_review"),
+            ("task-active", "active"),
+        )
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--state", "ready_for_review", "--no-fzf"])
+        result = run_browse(tasks_dir, filter_state="ready_for_review")
         assert result.exit_code == 0
-        assert "task-review" in result.output
-        assert "task-active" not in result.output
+        out = result.output
+        assert "task-review" in out
+        assert "task-active" not in out
 
-    def test_browse_state_filter_ready_for_review_alias(self, tmp_path, monkeypatch):
+    def test_browse_state_filter_ready_for_review_alias(
+        self, tasks_dir_factory, monkeypatch, runner
+    ):
         """--state should accept ready-for-review as a CLI alias."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-review", "ready_for_review")
+        tasks_dir = tasks_dir_factory(("task-review", "ready_for_review"))
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--state", "ready-for-review", "--no-fzf"])
+        result = runner.invoke(browse, ["--state", "ready-for-review", "--no-fzf"])
         assert result.exit_code == 0
         assert "task-review" in result.output
 
@@ -214,30 +394,28 @@ class TestBrowseStateFilter:
 class TestBrowsePagerFallback:
     """Test pager fallback when fzf is unavailable."""
 
-    def test_browse_fzf_unavailable_falls_back_to_pager(self, tmp_path, monkeypatch):
+    def test_browse_fzf_unavailable_falls_back_to_pager(
+        self, tasks_dir_factory, monkeypatch, runner
+    ):
         """When fzf is not installed, should use pager output."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", content="This is task content.")
+        tasks_dir = tasks_dir_factory(
+            ("my-task", "active", "medium", None, "This is task content.")
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
         with patch("shutil.which", return_value=None):
-            runner = CliRunner()
-            result = runner.invoke(cli, ["browse"])
+            result = runner.invoke(browse, [])
             # Should not crash, should show content
             assert result.exit_code == 0
             assert "my-task" in result.output
 
-    def test_browse_no_fzf_flag_forces_pager(self, tmp_path, monkeypatch):
+    def test_browse_no_fzf_flag_forces_pager(self, tasks_dir_factory, monkeypatch, runner):
         """--no-fzf should use pager even when fzf is available."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", content="Pager content here.")
+        tasks_dir = tasks_dir_factory(("my-task", "active", "medium", None, "Pager content here."))
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
         with patch("shutil.which", return_value="/usr/bin/fzf"):
-            runner = CliRunner()
-            result = runner.invoke(cli, ["browse", "--no-fzf"])
+            result = runner.invoke(browse, ["--no-fzf"])
             assert result.exit_code == 0
             assert "my-task" in result.output
 
@@ -245,41 +423,34 @@ class TestBrowsePagerFallback:
 class TestBrowsePagerContentFormat:
     """Test that pager output has proper formatting."""
 
-    def test_browse_pager_content_format(self, tmp_path, monkeypatch):
+    def test_browse_pager_content_format(self, tasks_dir_factory):
         """Pager output should contain task name, state, and content with separators."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "alpha-task", "active", content="Alpha body text.")
-        create_task(tasks_dir, "beta-task", "backlog", content="Beta body text.")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        tasks_dir = tasks_dir_factory(
+            ("alpha-task", "active", "medium", None, "Alpha body text."),
+            ("beta-task", "backlog", "medium", None, "Beta body text."),
+        )
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--no-fzf"])
+        result = run_browse(tasks_dir)
         output = result.output
 
-        # Should contain both task names
-        assert "alpha-task" in output
-        assert "beta-task" in output
-        # Should contain task content bodies
-        assert "Alpha body text." in output
-        assert "Beta body text." in output
+        # Should contain both task names and their content bodies
+        assert all(
+            s in output for s in ("alpha-task", "beta-task", "Alpha body text.", "Beta body text.")
+        )
         # Should contain separators (visual dividers between tasks)
         assert "═" in output or "---" in output or "===" in output
 
-    def test_browse_pager_shows_autonomy_metadata(self, tmp_path, monkeypatch):
+    def test_browse_pager_shows_autonomy_metadata(self, tmp_path):
         """Pager output should surface autonomy metadata for tasks."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(
             tasks_dir,
             "interactive-task",
             "active",
             extra_meta={"autonomy": "interactive_only"},
         )
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse", "--no-fzf"])
+        result = run_browse(tasks_dir)
         assert result.exit_code == 0
         assert "Autonomy: interactive_only" in result.output
 
@@ -287,189 +458,107 @@ class TestBrowsePagerContentFormat:
 class TestBrowseFzfMode:
     """Test fzf interactive mode."""
 
-    def test_browse_fzf_available(self, tmp_path, monkeypatch):
-        """When fzf is available, should invoke subprocess with fzf."""
+    def test_browse_fzf_available(self, tmp_path, monkeypatch, runner, fzf_patched):
+        """When fzf is available, should invoke fzf."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(tasks_dir, "my-task", "active")
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        mock_result = MagicMock()
-        mock_result.returncode = 130  # User cancelled with Esc
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            result = runner.invoke(cli, ["browse"])
-            assert result.exit_code == 0
-            assert len(_get_fzf_calls(mock_run)) == 1
+        # fzf_patched's default result is the user cancelling with Esc
+        result = runner.invoke(browse, [])
+        assert result.exit_code == 0
+        assert len(fzf_patched.calls) == 1
 
-    def test_browse_fzf_preview_command(self, tmp_path, monkeypatch):
+    def test_browse_fzf_preview_command(self, tmp_path, monkeypatch, runner, fzf_patched):
         """fzf should be called with --preview containing gptodo show."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(tasks_dir, "my-task", "active")
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            assert len(fzf_calls) == 1
-            fzf_cmd = fzf_calls[0][0][0]
-            preview = _get_fzf_arg(fzf_cmd, "--preview")
-            assert preview is not None
-            assert "gptodo" in preview and "show" in preview
-
-    def test_browse_fzf_selection_prints_task_id(self, tmp_path, monkeypatch):
+        runner.invoke(browse, [])
+        fzf_calls = fzf_patched.calls
+        assert len(fzf_calls) == 1
+        fzf_cmd = fzf_calls[0]
+        preview = _get_fzf_arg(fzf_cmd, "--preview")
+        assert preview is not None
+        assert "gptodo" in preview and "show" in preview
+
+    def test_browse_fzf_selection_prints_task_id(self, tmp_path, monkeypatch, runner, fzf_patched):
         """When user selects a task in fzf, should print the task ID."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(tasks_dir, "selected-task", "active")
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        mock_fzf_result = MagicMock()
-        mock_fzf_result.returncode = 0
-        mock_fzf_result.stdout = "selected-task  🏃 active  🟡      3d"
+        fzf_patched.result = _FakeCompleted(
+            returncode=0, stdout="selected-task  🏃 active  🟡      3d"
+        )
 
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_fzf_result)),
-        ):
-            runner = CliRunner()
-            result = runner.invoke(cli, ["browse"])
-            assert "selected-task" in result.output
+        result = runner.invoke(browse, [])
+        assert "selected-task" in result.output
 
 
 class TestBrowseFzfKeyHints:
     """Test that fzf border label contains keybinding hints."""
 
-    def test_browse_fzf_border_label_contains_hints(self, tmp_path, monkeypatch):
+    def test_browse_fzf_border_label_contains_hints(self, fzf_cmd):
         """fzf should have a border-label with keybinding hints."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            label = _get_fzf_arg(fzf_cmd, "--border-label")
-            assert label is not None
-            # Should contain the command palette hint
-            assert "?" in label
-            # Should contain key hints for common actions
-            assert "Auto" in label
-            assert "Sort" in label
-            assert "Filter" in label
-            assert "Edit" in label
-            assert "Preview" in label
-            assert "Raw" in label
-            assert "Layout" in label
-
-    def test_browse_fzf_border_label_at_bottom(self, tmp_path, monkeypatch):
+        label = _get_fzf_arg(fzf_cmd, "--border-label")
+        assert label is not None
+        # Should contain the command palette hint
+        assert "?" in label
+        # Should contain key hints for common actions
+        assert "Auto" in label
+        assert "Sort" in label
+        assert "Filter" in label
+        assert "Edit" in label
+        assert "Preview" in label
+        assert "Raw" in label
+        assert "Layout" in label
+
+    def test_browse_fzf_border_label_at_bottom(self, fzf_cmd):
         """Border label should be positioned at bottom."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            pos = _get_fzf_arg(fzf_cmd, "--border-label-pos")
-            assert pos is not None
-            assert "bottom" in pos
+        pos = _get_fzf_arg(fzf_cmd, "--border-label-pos")
+        assert pos is not None
+        assert "bottom" in pos
 
 
 class TestBrowseFzfBindings:
     """Test that fzf keybindings are correctly configured."""
 
-    def _get_bindings(self, tmp_path, monkeypatch):
-        """Helper to invoke browse and return the --bind string."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            return _get_fzf_arg(fzf_cmd, "--bind")
-
-    def test_browse_fzf_command_palette_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ?:execute(...) for the command palette."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
+    @pytest.mark.parametrize(
+        "substrings",
+        [
+            ("?:execute(", "palette.sh"),
+            ("ctrl-s:execute(", "sort-picker.sh"),
+            ("ctrl-f:execute(", "filter-picker.sh"),
+            ("ctrl-t:execute(", "state-change.sh"),
+            ("ctrl-a:execute(", "autonomy-change.sh"),
+            ("ctrl-e:execute(", "edit-task.sh"),
+            ("ctrl-b:change-preview(", "git", "blame"),
+            ("ctrl-l:change-preview(", "git", "log"),
+            ("ctrl-p:change-preview(", "gptodo show --render"),
+            ("ctrl-w:change-preview-window(", "down:", "right:"),
+            ("ctrl-/:toggle-preview",),
+        ],
+        ids=[
+            "command-palette",
+            "sort",
+            "filter",
+            "state-change",
+            "autonomy-change",
+            "edit",
+            "blame",
+            "log",
+            "preview-reset",
+            "layout-toggle",
+            "toggle-preview",
+        ],
+    )
+    def test_browse_fzf_binding(self, fzf_cmd, substrings):
+        """fzf --bind should include each expected key binding and its action."""
+        bindings = _get_fzf_arg(fzf_cmd, "--bind")
         assert bindings is not None
-        assert "?:execute(" in bindings
-        assert "palette.sh" in bindings
-
-    def test_browse_fzf_sort_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-s for sort picker."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-s:execute(" in bindings
-        assert "sort-picker.sh" in bindings
-
-    def test_browse_fzf_filter_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-f for filter picker."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-f:execute(" in bindings
-        assert "filter-picker.sh" in bindings
-
-    def test_browse_fzf_state_change_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-t for state change."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-t:execute(" in bindings
-        assert "state-change.sh" in bindings
-
-    def test_browse_fzf_autonomy_change_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-a for autonomy change."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-a:execute(" in bindings
-        assert "autonomy-change.sh" in bindings
-
-    def test_browse_fzf_edit_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-e with $EDITOR."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-e:execute(" in bindings
-        assert "edit-task.sh" in bindings
+        assert all(s in bindings for s in substrings)
 
     def test_browse_edit_helper_uses_nano_with_tty(self, tmp_path):
         """Browse edit helper should default to nano and attach to /dev/tty."""
@@ -509,48 +598,15 @@ class TestBrowseFzfBindings:
         assert "Change autonomy -> interactive_only" in palette_script
         assert "Change autonomy -> inherit default" in palette_script
 
-    def test_browse_fzf_blame_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-b with git blame."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-b:change-preview(" in bindings
-        assert "git" in bindings and "blame" in bindings
-
-    def test_browse_fzf_log_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-l with git log."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-l:change-preview(" in bindings
-        assert "git" in bindings and "log" in bindings
-
-    def test_browse_fzf_preview_reset_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-p to reset preview with rendered markdown."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-p:change-preview(" in bindings
-        assert "gptodo show --render" in bindings
-
-    def test_browse_fzf_layout_toggle_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-w to toggle preview layout."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-w:change-preview-window(" in bindings
-        assert "down:" in bindings
-        assert "right:" in bindings
-
-    def test_browse_fzf_toggle_preview_binding(self, tmp_path, monkeypatch):
-        """fzf --bind should include ctrl-/ to toggle preview."""
-        bindings = self._get_bindings(tmp_path, monkeypatch)
-        assert "ctrl-/:toggle-preview" in bindings
-
 
 class TestBrowseListCommand:
     """Test the browse-list hidden subcommand."""
 
-    def test_browse_list_output_format(self, tmp_path, monkeypatch):
+    def test_browse_list_output_format(self, tasks_dir_factory, monkeypatch, runner):
         """browse-list should produce header + space-aligned data lines."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", priority="high", project="myproj")
+        tasks_dir = tasks_dir_factory(("my-task", "active", "high", "myproj"))
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
         result = runner.invoke(cli, ["browse-list"])
         assert result.exit_code == 0
         lines = result.output.strip().split("\n")
@@ -565,111 +621,96 @@ class TestBrowseListCommand:
         assert "active" in lines[1]
         assert "myproj" in lines[1]
 
-    def test_browse_list_default_filter(self, tmp_path, monkeypatch):
+    def test_browse_list_default_filter(self, canonical_tasks_dir, monkeypatch, runner):
         """browse-list should default to current open-work states."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-backlog", "backlog")
-        create_task(tasks_dir, "task-todo", "todo")
-        create_task(tasks_dir, "task-review", "ready_for_review")
-        create_task(tasks_dir, "task-done", "done")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        monkeypatch.setenv("GPTODO_TASKS_DIR", str(canonical_tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list"])
-        assert "task-active" in result.output
-        assert "task-backlog" in result.output
-        assert "task-todo" in result.output
-        assert "task-review" in result.output
-        assert "task-done" not in result.output
+        out = runner.invoke(cli, ["browse-list"]).output
+        assert all(s in out for s in ("t-active", "t-backlog", "t-todo", "t-review"))
+        assert "t-done" not in out
 
-    def test_browse_list_all_flag(self, tmp_path, monkeypatch):
+    def test_browse_list_all_flag(self, tasks_dir_factory, monkeypatch, runner):
         """browse-list --all should include done/cancelled tasks."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-done", "done")
+        tasks_dir = tasks_dir_factory(
+            ("task-active", "active"),
+            ("task-done", "done"),
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--all"])
-        assert "task-active" in result.output
-        assert "task-done" in result.output
+        out = runner.invoke(cli, ["browse-list", "--all"]).output
+        assert all(s in out for s in ("task-active", "task-done"))
 
-    def test_browse_list_state_filter(self, tmp_path, monkeypatch):
+    def test_browse_list_state_filter(self, tasks_dir_factory, monkeypatch, runner):
         """browse-list --state should filter by state."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-active", "active")
-        create_task(tasks_dir, "task-backlog", "backlog")
+        tasks_dir = tasks_dir_factory(
+            ("task-active", "active"),
+            ("task-backlog", "backlog"),
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--state", "active"])
-        assert "task-active" in result.output
-        assert "task-backlog" not in result.output
+        out = runner.invoke(cli, ["browse-list", "--state", "active"]).output
+        assert "task-active" in out
+        assert "task-backlog" not in out
 
-    def test_browse_list_project_filter(self, tmp_path, monkeypatch):
+    def test_browse_list_project_filter(self, tasks_dir_factory, monkeypatch, runner):
         """browse-list --project should filter by project."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-gptme", "active", project="gptme")
-        create_task(tasks_dir, "task-other", "active", project="other")
+        tasks_dir = tasks_dir_factory(
+            ("task-gptme", "active", "medium", "gptme"),
+            ("task-other", "active", "medium", "other"),
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--project", "gptme"])
-        assert "task-gptme" in result.output
-        assert "task-other" not in result.output
+        out = runner.invoke(cli, ["browse-list", "--project", "gptme"]).output
+        assert "task-gptme" in out
+        assert "task-other" not in out
 
 
 class TestBrowseListSort:
     """Test browse-list sort modes."""
 
-    def test_browse_list_sort_priority(self, tmp_path, monkeypatch):
-        """--sort priority should order high before medium before low."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "task-low", "active", priority="low")
-        create_task(tasks_dir, "task-high", "active", priority="high")
-        create_task(tasks_dir, "task-medium", "active", priority="medium")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--sort", "priority"])
-        lines = result.output.strip().split("\n")
-        task_names = [line.split()[0] for line in lines[1:]]  # skip header
-        assert task_names == ["task-high", "task-medium", "task-low"]
-
-    def test_browse_list_sort_name(self, tmp_path, monkeypatch):
-        """--sort name should order alphabetically."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "charlie", "active")
-        create_task(tasks_dir, "alpha", "active")
-        create_task(tasks_dir, "bravo", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--sort", "name"])
+    @pytest.mark.parametrize(
+        "sort_mode,tasks,expected",
+        [
+            (
+                "priority",
+                (
+                    ("task-low", "active", "low"),
+                    ("task-high", "active", "high"),
+                    ("task-medium", "active"),
+                ),
+                ["task-high", "task-medium", "task-low"],
+            ),
+            (
+                "name",
+                (("charlie", "active"), ("alpha", "active"), ("bravo", "active")),
+                ["alpha", "bravo", "charlie"],
+            ),
+        ],
+        ids=["priority", "name"],
+    )
+    def test_browse_list_sort(
+        self, tasks_dir_factory, monkeypatch, runner, sort_mode, tasks, expected
+    ):
+        """--sort priority orders high > medium > low; --sort name orders alphabetically."""
+        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir_factory(*tasks)))
+
+        result = runner.invoke(cli, ["browse-list", "--sort", sort_mode])
         lines = result.output.strip().split("\n")
         task_names = [line.split()[0] for line in lines[1:]]  # skip header
-        assert task_names == ["alpha", "bravo", "charlie"]
+        assert task_names == expected
 
-    def test_browse_list_sort_modified(self, tmp_path, monkeypatch):
+    def test_browse_list_sort_modified(self, tmp_path):
         """--sort modified should order by modification date (newest first)."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        # Create tasks with different modification times
-        create_task(tasks_dir, "old-task", "active")
-        time.sleep(0.05)
-        create_task(tasks_dir, "new-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        old_file, new_file = create_tasks_bulk(
+            tasks_dir, [("old-task", "active"), ("new-task", "active")]
+        )
+        # Set modification times explicitly rather than sleeping between writes
+        now = time.time()
+        os.utime(old_file, (now - 10, now - 10))
+        os.utime(new_file, (now, now))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["browse-list", "--sort", "modified"])
-        lines = result.output.strip().split("\n")
+        lines = _get_browse_lines(tasks_dir, sort_key="modified")
         task_names = [line.split()[0] for line in lines[1:]]  # skip header
         # Newest first
         assert task_names[0] == "new-task"
@@ -679,21 +720,14 @@ class TestBrowseListSort:
 class TestGetBrowseLines:
     """Test the _get_browse_lines helper function directly."""
 
-    def test_empty_dir(self, tmp_path):
+    def test_empty_dir(self, tasks_dir_factory):
         """Should return empty list for empty tasks dir."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        lines = _get_browse_lines(tasks_dir)
+        lines = _get_browse_lines(tasks_dir_factory())
         assert lines == []
 
-    def test_header_and_data_lines(self, tmp_path, monkeypatch):
+    def test_header_and_data_lines(self, tasks_dir_factory):
         """First line should be header, followed by space-aligned data lines."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", priority="high", project="proj")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        lines = _get_browse_lines(tasks_dir)
+        lines = _get_browse_lines(tasks_dir_factory(("my-task", "active", "high", "proj")))
         assert len(lines) == 2  # header + 1 data line
         # Header row
         assert "NAME" in lines[0]
@@ -703,18 +737,9 @@ class TestGetBrowseLines:
         # Data line: first field is task name
         assert lines[1].split()[0] == "my-task"
 
-    def test_filter_defaults_to_backlog_active(self, tmp_path, monkeypatch):
+    def test_filter_defaults_to_backlog_active(self, canonical_tasks_dir):
         """Default filter should include current open-work states."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "t-active", "active")
-        create_task(tasks_dir, "t-backlog", "backlog")
-        create_task(tasks_dir, "t-todo", "todo")
-        create_task(tasks_dir, "t-review", "ready_for_review")
-        create_task(tasks_dir, "t-done", "done")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        lines = _get_browse_lines(tasks_dir)
+        lines = _get_browse_lines(canonical_tasks_dir)
         names = [line.split()[0] for line in lines[1:]]  # skip header
         assert "t-active" in names
         assert "t-backlog" in names
@@ -722,163 +747,103 @@ class TestGetBrowseLines:
         assert "t-review" in names
         assert "t-done" not in names
 
-    def test_show_all(self, tmp_path, monkeypatch):
+    def test_show_all(self, canonical_tasks_dir):
         """show_all=True should include all tasks."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "t-active", "active")
-        create_task(tasks_dir, "t-done", "done")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        lines = _get_browse_lines(tasks_dir, show_all=True)
+        lines = _get_browse_lines(canonical_tasks_dir, show_all=True)
         names = [line.split()[0] for line in lines[1:]]  # skip header
         assert "t-active" in names
         assert "t-done" in names
 
+    def test_header_fast_path_matches_full_load(self, tmp_path):
+        """Header-only loading should agree with load_tasks, falling back where needed."""
+        tasks_dir = tmp_path / "tasks"
+        create_task(tasks_dir, "plain", "active", priority="high", created="2025-01-02")
+        create_task(
+            tasks_dir,
+            "quoted",
+            "todo",
+            project="proj",
+            created="2025-01-03T10:00:00+00:00",
+            extra_meta={"tags": "[a, b]", "modified": "'2025-02-01'"},
+        )
+        create_task(tasks_dir, "commented", "backlog", extra_meta={"project": "x  # note"})
+        create_task(tasks_dir, "no-created", "new")
+        (tasks_dir / "no-header.md").write_text("Just a body.\n")
+
+        def key(tasks):
+            fields = ("state", "priority", "project", "created", "modified")
+            return {t.name: tuple(getattr(t, f) for f in fields) for t in tasks}
+
+        assert key(_load_browse_tasks(tasks_dir)) == key(load_tasks_util(tasks_dir))
+
 
 class TestBrowseFzfPreviewLabel:
     """Test that fzf preview has a label."""
 
-    def test_browse_fzf_preview_label(self, tmp_path, monkeypatch):
+    def test_browse_fzf_preview_label(self, fzf_cmd):
         """fzf should have --preview-label set to Task Preview."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        label = _get_fzf_arg(fzf_cmd, "--preview-label")
+        assert label is not None
+        assert "Task Preview" in label
 
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            label = _get_fzf_arg(fzf_cmd, "--preview-label")
-            assert label is not None
-            assert "Task Preview" in label
-
-    def test_browse_fzf_blame_changes_preview_label(self, tmp_path, monkeypatch):
+    def test_browse_fzf_blame_changes_preview_label(self, fzf_cmd):
         """ctrl-b binding should include change-preview-label for Git Blame."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
+        bindings = _get_fzf_arg(fzf_cmd, "--bind")
+        assert "change-preview-label( Git Blame )" in bindings
 
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            bindings = _get_fzf_arg(fzf_cmd, "--bind")
-            assert "change-preview-label( Git Blame )" in bindings
-
-    def test_browse_fzf_log_changes_preview_label(self, tmp_path, monkeypatch):
+    def test_browse_fzf_log_changes_preview_label(self, fzf_cmd):
         """ctrl-l binding should include change-preview-label for Git Log."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            bindings = _get_fzf_arg(fzf_cmd, "--bind")
-            assert "change-preview-label( Git Log )" in bindings
+        bindings = _get_fzf_arg(fzf_cmd, "--bind")
+        assert "change-preview-label( Git Log )" in bindings
 
 
 class TestBrowseFzfRawBinding:
     """Test ctrl-r binding for raw markdown preview."""
 
-    def test_browse_fzf_raw_binding(self, tmp_path, monkeypatch):
+    def test_browse_fzf_raw_binding(self, fzf_cmd):
         """fzf --bind should include ctrl-r for raw markdown preview."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            bindings = _get_fzf_arg(fzf_cmd, "--bind")
-            assert "ctrl-r:change-preview(gptodo show {1})" in bindings
-            assert "change-preview-label( Raw Markdown )" in bindings
+        bindings = _get_fzf_arg(fzf_cmd, "--bind")
+        assert "ctrl-r:change-preview(gptodo show {1})" in bindings
+        assert "change-preview-label( Raw Markdown )" in bindings
 
 
 class TestShowRenderFlag:
     """Test the --render flag on the show command."""
 
-    def test_show_render_flag(self, tmp_path, monkeypatch):
+    def test_show_render_flag(self, tasks_dir_factory, monkeypatch, runner):
         """show --render should render markdown content."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", content="# Hello\n\nSome **bold** text.")
+        tasks_dir = tasks_dir_factory(
+            ("my-task", "active", "medium", None, "# Hello\n\nSome **bold** text.")
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
         result = runner.invoke(cli, ["show", "--render", "my-task"])
         assert result.exit_code == 0
         # Rich markdown renders bold differently — just check it doesn't crash
         # and the content appears
         assert "Hello" in result.output
 
-    def test_show_raw_flag(self, tmp_path, monkeypatch):
+    def test_show_raw_flag(self, tasks_dir_factory, monkeypatch, capsys):
         """show --raw should output raw markdown content."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", content="# Hello\n\nSome **bold** text.")
+        tasks_dir = tasks_dir_factory(
+            ("my-task", "active", "medium", None, "# Hello\n\nSome **bold** text.")
+        )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["show", "--raw", "my-task"])
-        assert result.exit_code == 0
-        assert "**bold**" in result.output
+        show("my-task", render=False)
+        assert "**bold**" in capsys.readouterr().out
 
-    def test_show_default_is_raw(self, tmp_path, monkeypatch):
+    def test_show_default_is_raw(self, tasks_dir_factory, monkeypatch, capsys):
         """show without --render should default to raw output."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active", content="Some **bold** text.")
+        tasks_dir = tasks_dir_factory(("my-task", "active", "medium", None, "Some **bold** text."))
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
-        result = runner.invoke(cli, ["show", "my-task"])
-        assert result.exit_code == 0
-        assert "**bold**" in result.output
+        show("my-task")
+        assert "**bold**" in capsys.readouterr().out
 
-    def test_show_includes_autonomy_metadata(self, tmp_path, monkeypatch):
+    def test_show_includes_autonomy_metadata(self, tmp_path, monkeypatch, runner):
         """show should surface autonomy metadata used by browse preview."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(
             tasks_dir,
             "interactive-task",
@@ -887,16 +852,14 @@ class TestShowRenderFlag:
         )
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
         result = runner.invoke(cli, ["show", "interactive-task"])
         assert result.exit_code == 0
-        assert "Autonomy" in result.output
-        assert "interactive_only" in result.output
+        out = result.output
+        assert all(s in out for s in ("Autonomy", "interactive_only"))
 
-    def test_show_named_task_uses_single_file_fast_path(self, tmp_path, monkeypatch):
+    def test_show_named_task_uses_single_file_fast_path(self, tmp_path, monkeypatch, runner):
         """show by task name should load only the selected file."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(
             tasks_dir,
             "fast-task",
@@ -914,7 +877,6 @@ class TestShowRenderFlag:
             return load_tasks_util(tasks_dir_arg, recursive=recursive, single_file=single_file)
 
         with patch("gptodo.cli.load_tasks", side_effect=tracked_load_tasks):
-            runner = CliRunner()
             result = runner.invoke(cli, ["show", "fast-task"])
 
         assert result.exit_code == 0
@@ -925,22 +887,20 @@ class TestShowRenderFlag:
 class TestEditAutonomy:
     """Test autonomy edits via the edit command."""
 
-    def test_edit_set_autonomy(self, tmp_path, monkeypatch):
+    def test_edit_set_autonomy(self, tmp_path, monkeypatch, runner):
         """edit should allow setting autonomy to interactive_only."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(tasks_dir, "interactive-task", "active")
         monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
 
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             ["edit", "interactive-task", "--set", "autonomy", "interactive_only"],
         )
 
         assert result.exit_code == 0
-        post = frontmatter.load(tasks_dir / "interactive-task.md")
-        assert post.metadata["autonomy"] == "interactive_only"
+        (task,) = load_tasks_util(tasks_dir, single_file=tasks_dir / "interactive-task.md")
+        assert task.metadata["autonomy"] == "interactive_only"
 
 
 class TestLoadTasksTimestampFallbacks:
@@ -949,7 +909,6 @@ class TestLoadTasksTimestampFallbacks:
     def test_load_tasks_avoids_git_when_modified_missing(self, tmp_path):
         """Missing modified should fall back to file mtime without git subprocesses."""
         tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
         create_task(tasks_dir, "mtime-task", "active", created="2026-04-03")
 
         with patch("gptodo.utils.subprocess.run", side_effect=AssertionError("unexpected git")):
@@ -961,91 +920,18 @@ class TestLoadTasksTimestampFallbacks:
 
 
 class TestBrowseFzfHeaderLines:
-    """Test that fzf uses --header-lines for column headers."""
-
-    def test_browse_fzf_header_lines(self, tmp_path, monkeypatch):
-        """fzf should have --header-lines 1 to freeze column header."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            header_lines = _get_fzf_arg(fzf_cmd, "--header-lines")
-            assert header_lines == "1"
-
-    def test_browse_fzf_has_border(self, tmp_path, monkeypatch):
-        """fzf should have --border for border-label to render on."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            assert "--border" in fzf_cmd
-
-    def test_browse_fzf_layout_reverse(self, tmp_path, monkeypatch):
-        """fzf should use --layout reverse so column headers appear at top."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            layout = _get_fzf_arg(fzf_cmd, "--layout")
-            assert layout == "reverse"
-
-    def test_browse_fzf_rendered_preview(self, tmp_path, monkeypatch):
-        """fzf --preview should use gptodo show --render."""
-        tasks_dir = tmp_path / "tasks"
-        tasks_dir.mkdir()
-        create_task(tasks_dir, "my-task", "active")
-        monkeypatch.setenv("GPTODO_TASKS_DIR", str(tasks_dir))
-
-        mock_result = MagicMock()
-        mock_result.returncode = 130
-        mock_result.stdout = ""
-
-        with (
-            patch("shutil.which", return_value="/usr/bin/fzf"),
-            patch("subprocess.run", side_effect=_fzf_side_effect(mock_result)) as mock_run,
-        ):
-            runner = CliRunner()
-            runner.invoke(cli, ["browse"])
-            fzf_calls = _get_fzf_calls(mock_run)
-            fzf_cmd = fzf_calls[0][0][0]
-            preview = _get_fzf_arg(fzf_cmd, "--preview")
-            assert "gptodo show --render" in preview
+    """Test fzf layout args: frozen column header, border and rendered preview."""
+
+    @pytest.mark.parametrize(
+        "checker",
+        [
+            lambda c: _get_fzf_arg(c, "--header-lines") == "1",
+            lambda c: "--border" in c,
+            lambda c: _get_fzf_arg(c, "--layout") == "reverse",
+            lambda c: "gptodo show --render" in (_get_fzf_arg(c, "--preview") or ""),
+        ],
+        ids=["header-lines", "border", "layout-reverse", "rendered-preview"],
+    )
+    def test_fzf_arg(self, fzf_cmd, checker):
+        """fzf should pin the column header at the top, with a border and rendered preview."""
+        assert checker(fzf_cmd)